@@ -7,29 +7,30 @@ and tool interactions.
 """
 
 # Standard library imports
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 from pathlib import Path
 import re
 import os
-import dotenv
+import json
+import asyncio
+import functools
 
 # Rich library imports
 from rich import box
 from rich.console import Console
 from rich.theme import Theme
 from rich.text import Text
-from rich.rule import Rule
 from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
 from rich.console import Group
+# Table and Syntax (which pulls in pygments) are only needed once a tool call is rendered,
+# so they are imported where they are used to keep CLI startup cheap.
+if TYPE_CHECKING:
+    from rich.table import Table
 
 # Local application imports
 from utils.path import display_path_rel_to_cwd
 from utils.text import truncate_text
 
-dotenv.load_dotenv()
-
 AGENT_THEME = Theme(
     {
         # General
@@ -57,11 +58,18 @@ AGENT_THEME = Theme(
     }
 )
 
-_console: Console | None = None
+# Streaming flush thresholds for assistant text deltas.
+# Every console.print call goes through Rich's full render pipeline, which is far more expensive
+# than the string work itself, so we buffer deltas and flush them in batches instead of per token.
+_STREAM_FLUSH_SIZE = 256 # Flush once this many characters are buffered.
+_STREAM_FLUSH_INTERVAL = 0.03 # Pending text is flushed ~30ms (about 30 fps) after it arrives so the output still feels live.
+
+_CONSOLE: Final[Console] = Console(theme=AGENT_THEME)
 # This is global because we want to use the same console instance throughout the application.
 # It would have multiple instances of console, there would be waste conditions for showing the output, 
 # and there would be a lot of spaghetti mess in the terminal and problems which would overrun the user. 
 # So it is the best practice for a good user experience to only have one singleton instance of console for us and for the user. 
+# It is built once at import time, so the theme object (and Rich's style caches built from it) is shared by everyone.
 
 def get_console() -> Console:
     """
@@ -73,10 +81,68 @@ def get_console() -> Console:
     Returns:
         The global Console instance.
     """
-    global _console
-    if _console is None:
-        _console = Console(theme=AGENT_THEME)
-    return _console
+    return _CONSOLE
+
+# Argument display order per tool, keys not listed here are shown after these in their original order.
+_PREFERED_ORDER: Final[dict[str, tuple[str, ...]]] = {
+    "read_file": ("path", "offset", "limit"),
+}
+
+# Longest dict/list argument (as compact JSON) shown in a tool panel before it's cut off.
+_MAX_ARG_VALUE_CHARS = 200
+
+# Pre-built title prefix for running tool calls, Text.assemble copies it so sharing it is safe.
+_TITLE_PREFIX = Text("● ", style="muted")
+
+@functools.lru_cache(maxsize=16)
+def _border_style(tool_kind: str | None) -> str:
+    """
+    Maps a tool kind to its theme style name (e.g. "read" -> "tool.read").
+
+    Args:
+        tool_kind: The kind of the tool, or None if unknown.
+
+    Returns:
+        The style name used for the tool panel border and title.
+    """
+    return f"tool.{tool_kind}" if tool_kind else "tool"
+
+def _make_args_grid() -> "Table":
+    """
+    Creates the two-column (key: value) grid used to display tool call arguments.
+
+    Keeps the column configuration in one place so each tool call only has to add its rows.
+
+    Returns:
+        An empty, pre-configured Table grid.
+    """
+    from rich.table import Table
+
+    table = Table.grid(padding=(0, 1))
+    table.add_column(style="muted", justify="right", no_wrap=True)
+    table.add_column(style="code", overflow="fold")
+    return table
+
+def _format_arg_value(value: Any) -> str:
+    """
+    Converts a tool argument value into the string shown in the arguments table.
+
+    Dicts and lists are dumped as compact JSON and shortened, so a large payload doesn't flood the panel.
+
+    Args:
+        value: The raw argument value.
+
+    Returns:
+        The display string for the value.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, separators=(",", ":"), default=str)
+        if len(text) > _MAX_ARG_VALUE_CHARS:
+            return text[:_MAX_ARG_VALUE_CHARS] + "…"
+        return text
+    return str(value)
 
 class TUI:
     """
@@ -95,9 +161,11 @@ class TUI:
         Args:
             console: An optional console instance to use. If None, the global one is used.
         """
-        self.console = _console or get_console()
+        self.console = console or _CONSOLE
         self._assistant_stream_open = False
-        self._tool_args_by_call_id: dict[str, dict[str, Any]] = {} # Caches the arguments for each tool call by its ID.
+        self._line_buffer: list[str] = [] # Pending assistant text deltas that haven't been printed yet.
+        self._line_buffer_size = 0
+        self._flush_handle: asyncio.TimerHandle | None = None # Scheduled flush for the pending buffer, if any.
         self.cwd: Path = Path.cwd()
 
     def begin_assitant(self) -> None:
@@ -118,18 +186,52 @@ class TUI:
 
         Ensures a clean break at the end of the streaming output.
         """
+        self._flush_line_buffer()
         if self._assistant_stream_open:
             self.console.print()
         self._assistant_stream_open = False
 
     def stream_assistant_messages(self, content: str) -> None:
         """
-        Prints a chunk of text from the assistant without a newline.
+        Buffers a chunk of text from the assistant and prints it without a newline.
+
+        The buffer is flushed right away when it contains a newline or grows past a size
+        threshold. Otherwise a single flush is scheduled on the event loop, so every delta
+        arriving in the meantime is grouped into the same console call (and the text still
+        shows up while we are waiting on the network for the next one).
 
         Args:
             content: The text delta to display.
         """
-        self.console.print(content, end="", markup=False, emoji=True)
+        self._line_buffer.append(content)
+        self._line_buffer_size += len(content)
+
+        if "\n" in content or self._line_buffer_size >= _STREAM_FLUSH_SIZE:
+            self._flush_line_buffer()
+        elif self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Not called from async code, nothing would ever run the scheduled flush.
+                self._flush_line_buffer()
+                return
+            self._flush_handle = loop.call_later(_STREAM_FLUSH_INTERVAL, self._flush_line_buffer)
+
+    def flush(self) -> None:
+        """Prints the assistant text that is still buffered, e.g. before the application exits."""
+        self._flush_line_buffer()
+
+    def _flush_line_buffer(self) -> None:
+        """Prints all the buffered assistant text in a single console call."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._line_buffer:
+            text = "".join(self._line_buffer)
+            self._line_buffer.clear()
+            self._line_buffer_size = 0
+            # Every batch goes through Rich, so word wrapping, emoji shortcodes and recording behave the same for all of them.
+            self.console.print(text, end="", markup=False, emoji=True)
 
     def _ordered_args(self, name: str, args: dict[str, Any]) -> list[tuple[str, Any]]:
         """
@@ -141,40 +243,48 @@ class TUI:
         Returns:
             A list of tuples containing the ordered arguments.
         """
-        _PREFERED_ORDER = {
-            "read_file": ["path", "offset", "limit"]
-        }
-
-        preferred = _PREFERED_ORDER.get(name, [])
-        ordered: list[tuple[str, Any]] = []
-        seen = set() # all the tools we have seen so far
-        
-        for key in preferred:
-            if key in args:
-                ordered.append((key, args[key]))
-                seen.add(key)
-
-        remaining_keys = set(args.keys() - seen)
-        ordered.extend((key, args[key]) for key in remaining_keys)
+        preferred = _PREFERED_ORDER.get(name, ())
+        # Preferred keys first, then the rest in the order the model sent them (dicts keep insertion order).
+        ordered: list[tuple[str, Any]] = [(key, args[key]) for key in preferred if key in args]
+        ordered.extend((key, value) for key, value in args.items() if key not in preferred)
         return ordered
 
-    def _render_args_table(self,tool_name: str, args: dict[str, Any]) -> Table:
+    def _arg_rows(self, tool_name: str, args: dict[str, Any]) -> list[tuple[str, str]]:
         """
-        Renders the arguments of a tool call as a table.
+        Builds the display rows for a tool call's arguments.
+
+        Rows are ordered, paths are made relative to the cwd and every value is turned into
+        a string once, so Rich doesn't have to inspect each cell when rendering.
 
         Args:
             tool_name: The name of the tool call.
             args: The arguments of the tool call.
 
+        Returns:
+            A list of (key, display value) tuples.
+        """
+        display_args = dict(args)
+        for key in ("path", "cwd"):
+            val = display_args.get(key)
+            if isinstance(val, str) and self.cwd:
+                display_args[key] = str(display_path_rel_to_cwd(val, self.cwd))
+
+        return [(key, _format_arg_value(value)) for key, value in self._ordered_args(tool_name, display_args)]
+
+    def _render_args_table(self, rows: list[tuple[str, str]]) -> "Table":
+        """
+        Renders the arguments of a tool call as a table.
+
+        Args:
+            rows: The pre-formatted (key, value) rows from _arg_rows.
+
         Returns:
             A table of arguments in a grid format (key: value).
         """
-        table = Table.grid(padding=(0, 1))
-        table.add_column(style="muted", justify="right", no_wrap=True)
-        table.add_column(style="code", overflow="fold")
+        table = _make_args_grid()
 
-        for key, value in self._ordered_args(tool_name, args):
-            table.add_row(key, value)
+        for row in rows:
+            table.add_row(*row)
 
         return table
 
@@ -194,25 +304,42 @@ class TUI:
             tool_kind: The kind of tool being called.
             arguments: The arguments passed to the tool.
         """
-        self._tool_args_by_call_id[call_id] = arguments
-        border_style = f"tool.{tool_kind}" if tool_kind else "tool"
+        # Buffered assistant text goes out first, so it stays above the panel.
+        self._flush_line_buffer()
+        self.console.print() # print a newline
+        self.console.print(self._build_tool_start_panel(call_id, name, tool_kind, arguments))
+
+    def _build_tool_start_panel(
+        self,
+        call_id: str,
+        name: str,
+        tool_kind: str | None,
+        arguments: dict[str, Any],
+    ) -> Panel:
+        """
+        Builds the "running..." panel shown when a tool call starts.
+
+        Args:
+            call_id: The unique identifier for the tool call.
+            name: The name of the tool being called.
+            tool_kind: The kind of tool being called.
+            arguments: The arguments passed to the tool.
+
+        Returns:
+            The panel displaying the tool call and its arguments.
+        """
+        rows = self._arg_rows(name, arguments)
+        border_style = _border_style(tool_kind)
 
         title = Text.assemble(
-            ("● ", "muted"), # • 
+            _TITLE_PREFIX,
             (name, f"{border_style} bold"),
             (" ", "muted"),
             (f"#{call_id[:10]}", "muted"),   
         )
 
-        display_args = dict(arguments)
-        for key in ("path", "cwd"):
-            val = display_args.get(key)
-            if isinstance(val, str) and self.cwd:
-                display_args[key] = str(display_path_rel_to_cwd(val, self.cwd))
-
-
-        panel = Panel(
-            self._render_args_table(name, display_args) if display_args else Text("No arguments", style="muted"),
+        return Panel(
+            self._render_args_table(rows) if rows else Text("No arguments", style="muted"),
             title=title,
             title_align="left",
             box=box.ROUNDED,
@@ -221,8 +348,6 @@ class TUI:
             subtitle=Text("running...", style="muted"),
             subtitle_align="right"
         )
-        self.console.print() # print a newline
-        self.console.print(panel)
 
     def _extract_read_file_code(self, text: str) -> tuple[int, str] | None:
         """
@@ -245,7 +370,9 @@ class TUI:
         code_lines: list[str] = []
         start_line: int | None = None
 
-        for line in body.splitlines():
+        # The read_file output is joined with "\n" only. split('\n') is a plain memchr scan, while splitlines()
+        # also breaks at every Unicode line boundary (form feeds, \x1c, \u2028, ...) that can appear inside a line of the file.
+        for line in body.split('\n'):
             # <number> | <code> -> Example: "1| print('Hello, world!')"
             # Also indentation matters, so we can't ignore the spaces.
             # -----------------------------------------------------------
@@ -318,6 +445,7 @@ class TUI:
             title: The title of the welcome message.
             lines: The lines of the welcome message.
         """
+        self._flush_line_buffer()
         body = "\n".join(lines)
         self.console.print(
             Panel(
@@ -354,7 +482,10 @@ class TUI:
             metadata: The metadata of the tool call.
             truncated: Whether the tool call was truncated.
         """
-        border_style = f"tool.{tool_kind}" if tool_kind else "tool"
+        from rich.syntax import Syntax
+
+        self._flush_line_buffer()
+        border_style = _border_style(tool_kind)
         status_icon = "✓" if success else "✗"
         status_style = "success" if success else "error"
 
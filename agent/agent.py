@@ -8,7 +8,7 @@ context, and interactions with the LLM client.
 from __future__ import annotations
 from pathlib import Path
 from typing import AsyncGenerator
-from agent.event import AgentEvent, AgentEventType
+from agent.event import AgentEvent, AgentEventType, AnyAgentEvent
 from client.llm_client import LLMClient
 from client.response import StreamEventType, ToolResultMessage, ToolCall
 from context.manager import ContextManager
@@ -24,12 +24,13 @@ class Agent:
     It acts as the middle layer that manages context and tools.
     """
     def __init__(self):
-        """Initializes the Agent with a new LLM client and context manager."""
-        self.llm_client = LLMClient()
+        """Initializes the Agent with its own LLM client, a context manager and a tool registry."""
+        # The LLMClient itself is cheap: it only attaches the process-wide HTTP connection pool on its first request.
+        self.llm_client: LLMClient | None = LLMClient()
         self.context_manager = ContextManager()
         self.tool_registry = create_default_registry()
 
-    async def run(self, message: str) -> AsyncGenerator[AgentEvent, None]:
+    async def run(self, message: str) -> AsyncGenerator[AnyAgentEvent, None]:
         """
         Starts an interaction cycle with a user message.
 
@@ -53,12 +54,13 @@ class Agent:
         async for event in self._agentic_loop():
             yield event
             
-            if event.type == AgentEventType.TEXT_COMPLETE:
-                final_response = event.data.get("content", "")
+            match event.type:
+                case AgentEventType.TEXT_COMPLETE:
+                    final_response = event.content
 
         yield AgentEvent.agent_end(final_response)
     
-    async def _agentic_loop(self) -> AsyncGenerator[AgentEvent, None]:
+    async def _agentic_loop(self) -> AsyncGenerator[AnyAgentEvent, None]:
         """
         The internal loop where the Agent communicates with the LLM.
 
@@ -72,9 +74,12 @@ class Agent:
         # messages = [
         #     {"role": "user", "content": "Hello"}
         # ] -> This is the structure the LLM API expects. 
-        response_text = ""
+        # Collected as chunks and joined once at the end, instead of growing an immutable string per token.
+        response_chunks: list[str] = []
 
         tool_schemas = self.tool_registry.get_schemas()
+        # The system prompt and tools must stay identical across turns for provider prompt caching.
+        self.context_manager.freeze_prefix(tool_schemas)
 
         tool_calls: list[ToolCall] = []
 
@@ -83,22 +88,30 @@ class Agent:
             tools=tool_schemas if tool_schemas else None,
             stream=True
         ):
-            if event.type == StreamEventType.TEXT_DELTA:
-                if event.text_delta:
-                    content = event.text_delta.content
-                    if content:
-                        yield AgentEvent.text_delta(content)
-                        response_text += content
-            
-            elif event.type == StreamEventType.TOOL_CALL_COMPLETE:
-                if event.tool_call:
-                    tool_calls.append(event.tool_call)
-
-            elif event.type == StreamEventType.ERROR:
-                yield AgentEvent.agent_error(event.error or "Unknow error occured.")
-
-        self.context_manager.add_assistant_message(
-            response_text or None,
+            match event.type:
+                case StreamEventType.TEXT_DELTA:
+                    if event.text_delta:
+                        content = event.text_delta.content
+                        if content:
+                            response_chunks.append(content)
+                            # The LLMClient already coalesces tiny deltas (with a deadline), forward them as they come.
+                            # A new (slots) event per delta, so consumers that keep events see their own text.
+                            yield AgentEvent.text_delta(content)
+
+                case StreamEventType.TOOL_CALL_COMPLETE:
+                    if event.tool_call:
+                        tool_calls.append(event.tool_call)
+
+                case StreamEventType.MESSAGE_COMPLETE:
+                    if event.usage:
+                        self.context_manager.add_usage(event.usage)
+
+                case StreamEventType.ERROR:
+                    yield AgentEvent.agent_error(event.error or "Unknow error occured.")
+
+        # The context manager hands back the exact string it stored, the completion event reuses it.
+        response_text = self.context_manager.add_assistant_message(
+            "".join(response_chunks) or None,
             tool_calls=[
                 {
                     "id": tool_call.call_id,
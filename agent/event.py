@@ -8,41 +8,47 @@ a transparent "glass box" view of the agent's internal reasoning and actions.
 from __future__ import annotations
 from client.response import TokenUsage
 from tools.base import ToolResult
-from typing import Any
-from dataclasses import dataclass, field
-from enum import StrEnum
+from typing import Any, ClassVar, Final
+from dataclasses import asdict, dataclass, field
 
-# @dataclass
-class AgentEventType(StrEnum):
+class AgentEventType:
     """
     Available types of events the Agent can emit.
     
     Categorized by lifecycle stages and streaming feedback.
+    These are plain string constants rather than a StrEnum: they are only ever compared
+    as identifiers, and raw (interned) str comparisons skip the Enum __eq__/__hash__ machinery.
     """
     # Agent Lifecycle
-    AGENT_START = "agent_start"
-    AGENT_END = "agent_end"
-    AGENT_ERROR = "agent_error"
+    AGENT_START: Final[str] = "agent_start"
+    AGENT_END: Final[str] = "agent_end"
+    AGENT_ERROR: Final[str] = "agent_error"
 
     # Tool Streaming
-    TOOL_CALL_START = "tool_call_start"
-    TOOL_CALL_COMPLETE = "tool_call_complete"
+    TOOL_CALL_START: Final[str] = "tool_call_start"
+    TOOL_CALL_COMPLETE: Final[str] = "tool_call_complete"
 
     # Text Streaming
-    TEXT_DELTA = "text_delta"
-    TEXT_COMPLETE = "text_complete"
+    TEXT_DELTA: Final[str] = "text_delta"
+    TEXT_COMPLETE: Final[str] = "text_complete"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentEvent:
     """
     A structured message emitted by the Agent.
 
+    Used for the low-frequency events (lifecycle, tool calls, errors). The per-token
+    text events have their own typed classes below (TextDeltaEvent, TextCompleteEvent),
+    which carry the content directly instead of a payload dictionary.
+    Uses slots (no per-instance __dict__) and is frozen since nothing changes an event
+    after it has been created.
+
     Attributes:
         type: The category of the event (START, END, DELTA, etc.).
         data: A dictionary containing event-specific information (e.g., content, error details).
     """
-    type: AgentEventType
+    type: str # One of the AgentEventType constants.
     data: dict[str, Any] = field(default_factory=dict)
 
     @classmethod
@@ -64,10 +70,17 @@ class AgentEvent:
             type=AgentEventType.AGENT_END,
             data={
                 "response": response, 
-                "usage": usage.__dict__ if usage else None
+                # Stored as-is, the dict form is only built if someone asks for it (see usage_dict).
+                "usage": usage,
             },
         )
 
+    @property
+    def usage_dict(self) -> dict[str, int] | None:
+        """The token usage of an agent_end event as a plain dictionary, or None if unavailable."""
+        usage = self.data.get("usage")
+        return asdict(usage) if usage else None
+
     @classmethod
     def agent_error(
         cls,
@@ -83,21 +96,15 @@ class AgentEvent:
             },
         )
 
-    @classmethod
-    def text_delta(cls, content: str) -> AgentEvent:
+    @staticmethod
+    def text_delta(content: str) -> TextDeltaEvent:
         """Creates an event containing a chunk of generated text."""
-        return cls(
-            type=AgentEventType.TEXT_DELTA,
-            data={"content": content},
-        )
+        return TextDeltaEvent(content=content)
 
-    @classmethod
-    def text_complete(cls, content: str) -> AgentEvent:
+    @staticmethod
+    def text_complete(content: str) -> TextCompleteEvent:
         """Creates an event containing the final completed text response."""
-        return cls(
-            type=AgentEventType.TEXT_COMPLETE,
-            data={"content": content},
-        )
+        return TextCompleteEvent(content=content)
 
     @classmethod
     def tool_call_start(cls, call_id: str, name: str, arguments: dict[str, Any]) -> AgentEvent:
@@ -127,9 +134,38 @@ class AgentEvent:
             },
         )
 
-    
 
-    
+# The text events are by far the most frequent ones (one per streamed chunk) and their payload
+# is always just the content, so they get a dedicated slot instead of a dict: one allocation
+# less per event and no string-keyed lookup for consumers. `type` is a class-level constant,
+# so consumers can keep dispatching on event.type like for any other AgentEvent.
+
+@dataclass(slots=True, frozen=True)
+class TextDeltaEvent:
+    """
+    A chunk of generated text emitted while the assistant response is streaming.
+
+    Attributes:
+        content: The text chunk.
+    """
+    type: ClassVar[str] = AgentEventType.TEXT_DELTA
+    content: str
+
+
+@dataclass(slots=True, frozen=True)
+class TextCompleteEvent:
+    """
+    The final, complete text of an assistant response.
+
+    Attributes:
+        content: The full response text.
+    """
+    type: ClassVar[str] = AgentEventType.TEXT_COMPLETE
+    content: str
+
+
+# Everything the Agent can yield.
+AnyAgentEvent = AgentEvent | TextDeltaEvent | TextCompleteEvent
 
 
 # ------------------------------------------------------------
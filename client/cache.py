@@ -0,0 +1,147 @@
+"""
+This module provides a response cache for deterministic LLM calls.
+
+When the same model is asked the exact same thing (same messages, same tools) and
+sampling is deterministic, the answer doesn't change, so it can be replayed from memory
+instead of paying for another round trip and the tokens. The cache is opt-in: it is only
+used when an LLMClient is given one.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Protocol
+import hashlib
+import json
+
+from client.response import StreamEvent, StreamEventType
+
+def cache_key(model: str, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, stream: bool) -> str:
+    """
+    Builds the cache key of a request.
+
+    Args:
+        model: The model the request is sent to.
+        messages: The messages of the request (OpenAI format).
+        tools: The tool schemas of the request, if any.
+        stream: Whether the response is streamed (streamed and non-streamed responses are stored apart).
+
+    Returns:
+        The SHA-256 hex digest of the canonical JSON form of the request.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "tools": tools, "stream": stream},
+        sort_keys=True,
+        default=str, # Anything that isn't plain JSON (shouldn't happen) still gets a stable form.
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """
+    The storage behind a ResponseCache.
+
+    The methods are async so that a remote store (e.g. Redis) can be plugged in
+    without changing the callers.
+    """
+    async def get(self, key: str) -> list[StreamEvent] | None: ...
+
+    async def set(self, key: str, events: list[StreamEvent]) -> None: ...
+
+
+class InMemoryBackend:
+    """
+    A process-local LRU store for cached responses.
+
+    Attributes:
+        max_entries: How many responses are kept before the least recently used one is dropped.
+    """
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initializes an empty store holding at most max_entries responses."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, list[StreamEvent]] = OrderedDict()
+
+    async def get(self, key: str) -> list[StreamEvent] | None:
+        """Returns the events stored under key (marking them as recently used), or None."""
+        events = self._entries.get(key)
+        if events is not None:
+            self._entries.move_to_end(key)
+        return events
+
+    async def set(self, key: str, events: list[StreamEvent]) -> None:
+        """Stores the events of a response, evicting the least recently used one if full."""
+        self._entries[key] = events
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """
+    Hit/miss counters of a ResponseCache.
+
+    Attributes:
+        hits: Requests answered from the cache.
+        misses: Requests that had to go to the provider.
+    """
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of requests answered from the cache (0.0 when nothing was asked yet)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    Caches the events of complete LLM responses, keyed by the request (see cache_key).
+
+    Only responses that completed without an error are stored. Stored events are
+    immutable StreamEvents, so one entry can be replayed any number of times.
+    A replayed response costs no tokens, so its usage is not stored: the completion
+    event is replayed with usage None and isn't counted as billed again.
+    """
+    def __init__(self, backend: CacheBackend | None = None) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            backend: Where the responses are stored, an InMemoryBackend by default.
+        """
+        self.backend: CacheBackend = backend or InMemoryBackend()
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> list[StreamEvent] | None:
+        """
+        Looks up a response and counts the hit or miss.
+
+        Args:
+            key: The cache key of the request.
+
+        Returns:
+            The stored events, or None on a miss.
+        """
+        events = await self.backend.get(key)
+        if events is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return events
+
+    async def set(self, key: str, events: list[StreamEvent]) -> None:
+        """
+        Stores the events of a complete response.
+
+        Args:
+            key: The cache key of the request.
+            events: The events of the response, in order.
+        """
+        message_complete = StreamEventType.MESSAGE_COMPLETE
+        events = [
+            replace(event, usage=None) if event.type is message_complete and event.usage is not None else event
+            for event in events
+        ]
+        await self.backend.set(key, events)
@@ -9,18 +9,99 @@ and error handling.
 from client.response import ToolCallDelta
 from client.response import StreamEventType
 from typing import Any, AsyncGenerator
-from openai import APIConnectionError, APIError, AsyncOpenAI, RateLimitError
+from openai import APIConnectionError, APIError, APITimeoutError, AsyncOpenAI, RateLimitError
+from openai.types import CompletionUsage
 import os
-from dotenv import load_dotenv
 import asyncio
+import contextlib
+from email.utils import parsedate_to_datetime
+import importlib.util
+import random
+import time
+import httpx
 
-from client.response import StreamEvent, TextDelta, TokenUsage, ToolCall, ToolCallDelta, parse_tool_call_arguments
-
-load_dotenv()
+from client.cache import ResponseCache, cache_key
+from client.response import StreamEvent, TextDelta, TokenUsage, ToolCall, ToolCallDelta, parse_tool_call_arguments, _json_loads
 
 # https://openrouter.ai/docs/quickstart#using-the-openai-sdk -> OpenRouter Docs
 # https://github.com/openai/openai-python?tab=readme-ov-file#async-usage -> OpenAI Python SDK Docs
 
+# One AsyncOpenAI client (and so one HTTP connection pool) is shared by every LLMClient in the process,
+# so requests reuse warm keep-alive connections instead of paying a new TCP + TLS handshake per client.
+# HTTP/2 lets concurrent requests multiplex over a single socket, it needs the optional `h2` package
+# (pip install "httpx[http2]") and we fall back to HTTP/1.1 with keep-alive when it isn't installed.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+# Generous read timeout: a non-streamed completion only starts answering once the whole reply is generated.
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+_shared_client: AsyncOpenAI | None = None
+_shared_client_refs = 0
+
+# Streamed text is coalesced until this many characters are buffered or this much time (seconds) has passed.
+_COALESCE_MAX_CHARS = 64
+_COALESCE_MAX_DELAY = 0.005
+
+def _usage_from_api(usage: CompletionUsage | dict[str, Any] | None) -> TokenUsage | None:
+    """
+    Converts the provider's usage stats into a TokenUsage.
+
+    Args:
+        usage: The usage of a completion, as the SDK model (non-streamed) or as the raw
+            dictionary of a streamed chunk, or None if the provider sent none.
+
+    Returns:
+        The equivalent TokenUsage, or None if there was no usage.
+    """
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        # Streamed chunks are plain dictionaries (see LLMClient._raw_stream), read them as-is.
+        prompt_tokens_details = usage.get("prompt_tokens_details")
+        return TokenUsage(
+            completion_tokens=usage.get("completion_tokens") or 0,
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            total_tokens=usage.get("total_tokens") or 0,
+            cached_tokens=(prompt_tokens_details.get("cached_tokens") or 0) if prompt_tokens_details else 0,
+        )
+    # Read the nested details model once (it is None for providers that don't report caching).
+    prompt_tokens_details = usage.prompt_tokens_details
+    return TokenUsage(
+        completion_tokens=usage.completion_tokens,
+        prompt_tokens=usage.prompt_tokens,
+        total_tokens=usage.total_tokens,
+        cached_tokens=(prompt_tokens_details.cached_tokens or 0) if prompt_tokens_details else 0,
+    )
+
+# Error types/codes that come back as a 429 but won't go away by retrying.
+_NON_RETRYABLE_RATE_LIMIT_ERRORS = frozenset({"insufficient_quota", "invalid_api_key"})
+
+def _acquire_shared_client() -> AsyncOpenAI:
+    """Returns the process-wide AsyncOpenAI client, creating it on first use, and takes a reference to it."""
+    global _shared_client, _shared_client_refs
+    if _shared_client is None:
+        _shared_client = AsyncOpenAI(
+            api_key=os.getenv("OPENROUTER_API_KEY", ""),
+            base_url=os.getenv("OPENROUTER_BASE_URL", ""),
+            http_client=httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=_HTTP_LIMITS,
+                timeout=_HTTP_TIMEOUT,
+            ),
+        )
+    _shared_client_refs += 1
+    return _shared_client
+
+async def _release_shared_client() -> None:
+    """Drops a reference to the shared AsyncOpenAI client and closes it once nobody is using it."""
+    global _shared_client, _shared_client_refs
+    _shared_client_refs -= 1
+    if _shared_client_refs <= 0 and _shared_client is not None:
+        client = _shared_client
+        _shared_client = None
+        _shared_client_refs = 0
+        await client.close()
+
 
 class LLMClient:
     """
@@ -29,15 +110,42 @@ class LLMClient:
     Handles initialization, connection management, and execution of chat completion 
     requests with robust error handling and retry mechanisms.
     """
-    def __init__(self) -> None:
-        """Initializes the LLMClient with environment-based configuration."""
+    # Retry backoff (seconds): the delay before retry n is drawn uniformly from [0, min(_CAP, _BASE * 2^n)].
+    _BASE: float = 0.5
+    _CAP: float = 30.0
+
+    def __init__(self, cache: ResponseCache | None = None) -> None:
+        """
+        Initializes the LLMClient with environment-based configuration.
+
+        Args:
+            cache: A cache to replay identical requests from. Only meant for deterministic calls
+                (e.g. temperature 0, tests/CI), so it is off unless given or RESPONSE_CACHE=1 is set.
+        """
         self._client : AsyncOpenAI | None = None
+        if cache is None and os.getenv("RESPONSE_CACHE") == "1":
+            cache = ResponseCache()
+        self.cache : ResponseCache | None = cache
         self._max_retries : int = int(os.getenv("MAX_RETRIES", 3))
         self._model : str = os.getenv("MODEL", "")
+        # Fail here with a clear message rather than after a full round trip ending in a 400 for "model": "".
+        if not self._model:
+            raise ValueError("The MODEL environment variable is not set, it must name the model to use.")
+        # The request arguments that are the same for every call, see _build_kwargs.
+        self._stream_kwargs : dict[str, Any] = {
+            "model": self._model,
+            "stream": True,
+            # Without it, OpenAI-compatible providers may leave the usage out of streamed responses.
+            "stream_options": {"include_usage": True},
+        }
+        self._complete_kwargs : dict[str, Any] = {
+            "model": self._model,
+            "stream": False,
+        }
 
     def get_client(self) -> AsyncOpenAI:
         """
-        Lazily initializes and returns the AsyncOpenAI client.
+        Lazily attaches and returns the shared AsyncOpenAI client.
 
         This ensures the client is only created when needed, using the 
         OpenRouter API key and base URL from environment variables.
@@ -46,22 +154,22 @@ class LLMClient:
             The initialized AsyncOpenAI client.
         """
         if self._client is None:
-            self._client = AsyncOpenAI(
-                api_key=os.getenv("OPENROUTER_API_KEY", ""),
-                base_url=os.getenv("OPENROUTER_BASE_URL", ""),
-            )
+            self._client = _acquire_shared_client()
         return self._client            
 
     async def close(self) -> None:
-        """Closes the underlying HTTP client and resets the client state."""
+        """Releases the shared HTTP client (closed once the last LLMClient lets go of it) and resets the client state."""
         if self._client:
-            await self._client.close()
             self._client = None
+            await _release_shared_client()
 
     def _build_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """
         Builds the tools list in the format required by the LLM client.
 
+        The schemas themselves are built once and cached by the tool registry (see
+        ToolRegistry.get_schemas), wrapping them is a handful of small dicts per request.
+
         Args:
             tools: A list of tools to build.
 
@@ -86,11 +194,99 @@ class LLMClient:
             for tool in tools
         ]
 
+    def _non_retryable_reason(self, exc: RateLimitError) -> str | None:
+        """
+        Checks whether a rate limit error is one that retrying can't fix.
+
+        Providers report exhausted quota / credits through the same 429 RateLimitError as a regular
+        rate limit, the error type or code in the body tells them apart.
+
+        Args:
+            exc: The rate limit error raised by the OpenAI SDK.
+
+        Returns:
+            The error type/code if the request should not be retried, None otherwise.
+        """
+        for reason in (exc.type, exc.code):
+            if reason in _NON_RETRYABLE_RATE_LIMIT_ERRORS:
+                return reason
+        return None
+
+    def _retry_after_from_headers(self, exc: Exception) -> float | None:
+        """
+        Reads how long the provider asked us to wait before retrying, if it said so.
+
+        Looks at the `Retry-After` header (seconds or an HTTP date) and falls back to `X-RateLimit-Reset`
+        (a reset timestamp, in seconds or milliseconds since the epoch, as sent by OpenRouter).
+
+        Args:
+            exc: The exception raised by the OpenAI SDK.
+
+        Returns:
+            The delay in seconds, or None if the response carries no usable hint.
+        """
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+            # HTTP-date form, e.g. "Wed, 21 Oct 2015 07:28:00 GMT".
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                return max(0.0, retry_at.timestamp() - time.time())
+
+        reset = headers.get("x-ratelimit-reset")
+        if reset:
+            try:
+                reset_at = float(reset)
+            except ValueError:
+                return None
+            if reset_at > 1e12: # milliseconds
+                reset_at /= 1000
+            return max(0.0, reset_at - time.time())
+
+        return None
+
+    async def _sleep_for_retry(self, attempt: int, exc: Exception) -> bool:
+        """
+        Waits before the next retry attempt, if there is one left.
+
+        Uses the provider's Retry-After hint when present (capped at _CAP), otherwise an
+        exponential backoff with full jitter: a random delay in [0, min(_CAP, _BASE * 2^attempt)].
+        The randomness means that requests failing at the same moment don't all retry at
+        exactly the same instant and hit the rate limit again together.
+
+        Args:
+            attempt: The attempt that just failed (0 for the first one).
+            exc: The exception that made the attempt fail.
+
+        Returns:
+            True if we slept and the request should be retried, False if retries are exhausted.
+        """
+        if attempt >= self._max_retries:
+            return False
+
+        delay = self._retry_after_from_headers(exc)
+        if delay is None:
+            delay = random.uniform(0, min(self._CAP, self._BASE * (2 ** attempt)))
+        else:
+            delay = min(delay, self._CAP)
+
+        await asyncio.sleep(delay)
+        return True
+
     async def chat_completion(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None = None,
         stream: bool = True,
+        coalesce: bool = True,
     ) -> AsyncGenerator[StreamEvent, None]:
         """
         Sends a chat completion request and yields the result as events.
@@ -98,69 +294,285 @@ class LLMClient:
         This is the primary method for interacting with the LLM. It supports
         both streaming and non-streaming modes and implements exponential backoff
         for transient errors like rate limits and connection issues.
+        Non-streaming requests are delegated to complete(), which callers can also use directly.
 
         Args:
             messages: A list of message dictionaries (OpenAI format).
             tools: A list of tool schemas for the LLM to use.
             stream: Whether to stream the response or wait for completion.
+            coalesce: Whether to merge small streamed text deltas into fewer events (streaming only).
 
         Yields:
             StreamEvent: Events representing text deltas, completion, or errors.
         """
 
-        client = self.get_client()
-        kwargs = {
-            "model": self._model,
-            "messages": messages,
-            "stream": stream,
-        }
+        if not stream:
+            # Non-streaming case: a single event, see complete().
+            yield await self.complete(messages, tools=tools)
+            # Why use yield in non-streaming case?
+            # Because of Architectural Uniformity (keeping things consistent).
+            return
+
+        # Replay an identical earlier response if caching is on.
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = cache_key(self._model, messages, tools, stream=True)
+            cached_events = await cache.get(key)
+            if cached_events is not None:
+                for event in cached_events:
+                    yield event
+                return
 
-        if tools:
-            kwargs["tools"] = self._build_tools(tools)
-            kwargs["tool_choice"] = "auto"
+        client = self.get_client()
+        kwargs = self._build_kwargs(messages, tools, stream=True)
         
         for attempt in range(self._max_retries + 1):
+            # Copy of the events of this attempt, stored in the cache once the response completed.
+            recorded: list[StreamEvent] | None = [] if cache is not None else None
+            # Whether this attempt already handed events to the consumer.
+            started = False
             try:
-                if stream:
-                    # Streaming case
-                    async for event in self._stream_response(client, kwargs):
+                # Streaming case: the events are pulled straight from the response, so a slow consumer
+                # also slows down the reads from the socket (the HTTP stream itself applies the backpressure).
+                # aclosing() hands the connection back right away when the consumer stops early.
+                async with contextlib.aclosing(self._stream_response(client, kwargs, coalesce)) as events:
+                    async for event in events:
+                        started = True
+                        if recorded is not None:
+                            recorded.append(event)
                         yield event
-                else:
-                    # Non-streaming case
-                    event = await self._non_stream_response(client, kwargs)
-                    yield event
-                    # Why use yield in non-streaming case?
-                    # Because of Architectural Uniformity (keeping things consistent).
+                if recorded is not None:
+                    await cache.set(key, recorded)
                 return
-            except RateLimitError as e:
-                #  If we encounter a rate limit error, we will retry the request.
-                # This will be based on exponential backoff i.e. we will wait for a longer time before, each time before retrying the request.
-                # ex: On first retry, we will wait for 1 second, on second retry, we will wait for 2 seconds, on third retry, we will wait for 4 seconds, and so on.
-                if attempt < self._max_retries:
-                    delay = 2 ** attempt # 2 ^ attempt
-                    await asyncio.sleep(delay)
-                else:
-                    yield StreamEvent.stream_error(error=f"Rate limit error: {e}")
+            except (RateLimitError, APIConnectionError) as e:
+                # Once part of the response went out, a retry would replay it from the start and duplicate
+                # the text the consumer already has. Only a request that failed before any output is retried.
+                if started:
+                    yield StreamEvent.stream_error(error=f"Stream interrupted: {e}")
                     return
-
-            except APIConnectionError as e:
-                if attempt < self._max_retries:
-                    delay = 2 ** attempt # 2 ^ attempt
-                    await asyncio.sleep(delay)
-                else:
-                    yield StreamEvent.stream_error(error=f"API connection error: {e}")
+                error = await self._retry_or_error(attempt, e)
+                if error:
+                    yield StreamEvent.stream_error(error=error)
                     return
 
             except APIError as e:
                 # It acts as an umbrella for anything that goes wrong on the provider's side or during the transit of data.
                 # No retries for this, just show error and return. It is a permanent error. Not a transient error like rate limit or connection error.
+                # (Request timeouts and server errors were already retried by the SDK before the response started.)
                 yield StreamEvent.stream_error(error=f"API error: {e}")
                 return
 
+    async def complete(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+    ) -> StreamEvent:
+        """
+        Sends a non-streaming chat completion request and returns the result as a single event.
+
+        Same retry behaviour as chat_completion, but without the async generator around it:
+        callers that don't need streaming simply await the final event.
+
+        Args:
+            messages: A list of message dictionaries (OpenAI format).
+            tools: A list of tool schemas for the LLM to use.
+
+        Returns:
+            The MESSAGE_COMPLETE event of the response, or an ERROR event.
+        """
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = cache_key(self._model, messages, tools, stream=False)
+            cached_events = await cache.get(key)
+            if cached_events is not None:
+                return cached_events[0]
+
+        client = self.get_client()
+        kwargs = self._build_kwargs(messages, tools, stream=False)
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                event = await self._non_stream_response(client, kwargs)
+                if cache is not None:
+                    await cache.set(key, [event])
+                return event
+            except (RateLimitError, APIConnectionError) as e:
+                error = await self._retry_or_error(attempt, e)
+                if error:
+                    return StreamEvent.stream_error(error=error)
+            except APIError as e:
+                # Permanent error, no retries (see chat_completion).
+                return StreamEvent.stream_error(error=f"API error: {e}")
+
+        # Not reached: the last attempt either returns or reports an error.
+        return StreamEvent.stream_error(error="Retries exhausted.")
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        stream: bool,
+    ) -> dict[str, Any]:
+        """
+        Builds the arguments of a chat completion request.
+
+        Args:
+            messages: A list of message dictionaries (OpenAI format).
+            tools: A list of tool schemas for the LLM to use.
+            stream: Whether the response is streamed.
+
+        Returns:
+            The keyword arguments for client.chat.completions.create.
+        """
+        # A fresh dict per request (requests of a batch run concurrently), copied from the fixed part.
+        kwargs = {
+            **(self._stream_kwargs if stream else self._complete_kwargs),
+            "messages": messages,
+        }
+
+        if tools:
+            kwargs["tools"] = self._build_tools(tools)
+            kwargs["tool_choice"] = "auto"
+        return kwargs
+
+    async def _retry_or_error(self, attempt: int, exc: RateLimitError | APIConnectionError) -> str | None:
+        """
+        Decides what to do after a transient error: wait for the next attempt, or give up.
+
+        Args:
+            attempt: The attempt that just failed (0 for the first one).
+            exc: The rate limit or connection error raised by the OpenAI SDK.
+
+        Returns:
+            None once we have waited and the request should be retried, otherwise the error message to report.
+        """
+        if isinstance(exc, RateLimitError):
+            #  If we encounter a rate limit error, we will retry the request.
+            # This will be based on exponential backoff i.e. we will wait for a longer time before, each time before retrying the request.
+            # (see _sleep_for_retry for how long exactly, and how the provider's Retry-After header is honored)
+            # Quota / key problems are reported through the same 429 but will fail every time, so don't wait for nothing.
+            non_retryable = self._non_retryable_reason(exc)
+            if non_retryable:
+                return f"Non-retryable rate limit error ({non_retryable}): {exc}"
+            if not await self._sleep_for_retry(attempt, exc):
+                return f"Rate limit error: {exc}"
+            return None
+
+        if not await self._sleep_for_retry(attempt, exc):
+            return f"API connection error: {exc}"
+        return None
+
+    async def chat_completion_batch(
+        self,
+        batch: list[list[dict[str, Any]]],
+        tools: list[dict[str, Any]] | None = None,
+        stream: bool = False,
+        *,
+        max_concurrency: int = 16,
+    ) -> list[list[StreamEvent]]:
+        """
+        Runs several chat completion requests concurrently and collects their events.
+
+        All requests run inside one asyncio.TaskGroup, and a semaphore bounds how many are
+        in flight at once, so a large batch doesn't turn into a burst of rate-limited (429) calls.
+
+        Args:
+            batch: A list of conversations, each a list of message dictionaries (OpenAI format).
+            tools: A list of tool schemas shared by every request.
+            stream: Whether each request should be streamed.
+            max_concurrency: The maximum number of requests in flight at the same time.
+
+        Returns:
+            The events of each request, in the same order as the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: list[list[StreamEvent]] = [[] for _ in batch]
+
+        async with asyncio.TaskGroup() as tg:
+            for i, messages in enumerate(batch):
+                tg.create_task(self._collect_completion(messages, tools, stream, semaphore, results[i]))
+
+        return results
+
+    async def _collect_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        stream: bool,
+        semaphore: asyncio.Semaphore,
+        events: list[StreamEvent],
+    ) -> None:
+        """
+        Runs a single request of a batch once a concurrency slot is free.
+
+        Args:
+            messages: The conversation for this request.
+            tools: A list of tool schemas for the LLM to use.
+            stream: Whether to stream the response.
+            semaphore: The semaphore bounding the batch concurrency.
+            events: The list the events of this request are collected into.
+        """
+        async with semaphore:
+            if not stream:
+                events.append(await self.complete(messages, tools=tools))
+                return
+            async for event in self.chat_completion(messages, tools=tools, stream=True):
+                events.append(event)
+
+    async def _raw_stream(
+        self,
+        client: AsyncOpenAI,
+        kwargs: dict[str, Any],
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Sends a streamed chat completion request and yields the raw chunks.
+
+        The request goes through the SDK's public raw response API (with_streaming_response), so
+        status errors, timeouts and the SDK's own retries (408, 409, 429, 5xx) work as for any
+        other call. Only the body is read here: every `data: {...}` SSE line is decoded into a
+        dictionary, nothing more, instead of the SDK validating a pydantic model per chunk.
+
+        Args:
+            client: The AsyncOpenAI client.
+            kwargs: Arguments for the completion call.
+
+        Yields:
+            The decoded chunks, until the `[DONE]` terminator.
+        """
+        async with client.chat.completions.with_streaming_response.create(**kwargs) as response:
+            request = response.http_request
+            try:
+                async for line in response.iter_lines():
+                    # Skip blank separators and SSE comments (e.g. OpenRouter's ": OPENROUTER PROCESSING" keep-alives).
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        return
+                    try:
+                        chunk = _json_loads(data)
+                    except ValueError as e:
+                        # Both json.JSONDecodeError and orjson.JSONDecodeError are ValueErrors.
+                        raise APIError(f"Malformed stream chunk: {data[:200]!r}", request, body=None) from e
+                    # Errors that happen after the response started come as a chunk of their own.
+                    error = chunk.get("error")
+                    if error:
+                        message = error.get("message") if isinstance(error, dict) else str(error)
+                        raise APIError(message or "Stream error", request, body=error)
+                    yield chunk
+            # The body is read by httpx directly, so its errors are mapped like the SDK does for the request itself.
+            except httpx.TimeoutException as e:
+                raise APITimeoutError(request=request) from e
+            except httpx.TransportError as e:
+                raise APIConnectionError(request=request) from e
+
     async def _stream_response(
         self,
         client: AsyncOpenAI,
-        kwargs: dict[str, Any]
+        kwargs: dict[str, Any],
+        coalesce: bool = True,
     ) -> AsyncGenerator[StreamEvent, None]: 
         """
         Internal method to handle the complexities of streaming responses.
@@ -168,9 +580,21 @@ class LLMClient:
         Processes chunks as they arrive, extracts text deltas, and handles
         final usage stats and termination reasons.
 
+        With coalescing on, text deltas (often a single token of a few characters) are
+        buffered and emitted as one event once enough text piled up or a few milliseconds
+        have passed since the first buffered piece, so consumers handle fewer events.
+        The time bound is a real deadline: while text is buffered, the next chunk is awaited
+        with a timeout, so the text also goes out when the provider pauses. The buffer is
+        always flushed before tool call events, at the end of the message and before an
+        error is raised, so the order of events is preserved and no received text is lost.
+
+        The chunks are read as plain dictionaries straight from the SSE body (see _raw_stream)
+        instead of going through the SDK, which validates a full pydantic model per chunk.
+
         Args:
-            client: The AsyncOpenAI client.
+            client: The AsyncOpenAI client (for its base URL and auth headers).
             kwargs: Arguments for the completion call.
+            coalesce: Whether to coalesce small text deltas.
 
         Yields:
             StreamEvent: Text deltas and final completion event.
@@ -178,84 +602,165 @@ class LLMClient:
 
         # There will be only one finish reason and one usage for the entire response.
         finish_reason : str | None = None
-        usage : TokenUsage | None = None
+        usage : dict[str, Any] | None = None # The provider's usage, converted to a TokenUsage at the end.
+        # Arguments are collected as a list of pieces per tool call and joined once at the end (linear, not quadratic, copying).
         tool_calls : dict[int, dict[str, Any]] = {}
 
-        response = await client.chat.completions.create(**kwargs)
+        # Bind the event factories to locals once, every chunk would otherwise resolve them
+        # through a global + class attribute lookup (LOAD_FAST is much cheaper on a hot loop).
+        stream_text = StreamEvent.stream_text
+        stream_tool_call_start = StreamEvent.stream_tool_call_start
+        stream_tool_call_delta = StreamEvent.stream_tool_call_delta
+        get_tool_call = tool_calls.get
+
+        text_buffer: list[str] = []
+        text_buffer_size = 0
+        text_buffer_started = 0.0
+        loop_time = asyncio.get_running_loop().time
+
+        chunks = self._raw_stream(client, kwargs)
+        next_chunk = chunks.__anext__
+        # The read of the next chunk while text is buffered, run as a task so it can be waited on with a timeout.
+        pending: asyncio.Future[dict[str, Any]] | None = None
         # Iterating over the chunks of the response.
-        async for chunk in response:
-            # If the chunk has usage(last chunk), then we create a TokenUsage object.
-            if hasattr(chunk, "usage") and chunk.usage:
-                usage = TokenUsage(
-                    completion_tokens=chunk.usage.completion_tokens,
-                    prompt_tokens=chunk.usage.prompt_tokens,
-                    total_tokens=chunk.usage.total_tokens,
-                    cached_tokens=chunk.usage.prompt_tokens_details.cached_tokens,
-                )
-
-            # If there are no choices, then we skip the chunk.
-            if not chunk.choices:
-                continue
-
-            choice = chunk.choices[0]
-            delta = choice.delta
-
-            if choice.finish_reason:
-                finish_reason = choice.finish_reason
-
-            if delta.content:
-                yield StreamEvent.stream_text(content=delta.content)
+        # Always hand the connection back, also when the consumer stops early or something raises.
+        # The body is read up to the [DONE] terminator even once the finish reason and the usage are in:
+        # closing an HTTP/1.1 response before its end makes httpcore drop the connection instead of keeping it alive.
+        try:
+            while True:
+                try:
+                    if text_buffer:
+                        # Wait for the next chunk only until the buffered text is due, then let the text out first.
+                        pending = asyncio.ensure_future(next_chunk())
+                        timeout = text_buffer_started + _COALESCE_MAX_DELAY - loop_time()
+                        done, _ = await asyncio.wait((pending,), timeout=max(0.0, timeout))
+                        if not done:
+                            event = stream_text("".join(text_buffer))
+                            text_buffer.clear()
+                            text_buffer_size = 0
+                            yield event
+                        chunk = await pending
+                        pending = None
+                    else:
+                        chunk = await next_chunk()
+                except StopAsyncIteration:
+                    break
+
+                # If there are no choices, then we skip the chunk.
+                choices = chunk.get("choices")
+                if not choices:
+                    # The usage often arrives in a last chunk of its own, after the one with the finish reason.
+                    # We keep it and build the TokenUsage once after the loop.
+                    chunk_usage = chunk.get("usage")
+                    if chunk_usage is not None:
+                        usage = chunk_usage
+                    continue
+
+                choice = choices[0]
+                delta = choice.get("delta") or {}
+                choice_finish_reason = choice.get("finish_reason")
+
+                if choice_finish_reason:
+                    finish_reason = choice_finish_reason
+                    # Usage is only ever sent at the end: on the chunk with the finish reason or on a
+                    # choice-less chunk after it, so the per-token chunks don't need to be probed for it.
+                    chunk_usage = chunk.get("usage")
+                    if chunk_usage is not None:
+                        usage = chunk_usage
+
+                content = delta.get("content")
+                if content:
+                    if coalesce:
+                        if not text_buffer:
+                            text_buffer_started = loop_time()
+                        text_buffer.append(content)
+                        text_buffer_size += len(content)
+                    else:
+                        yield stream_text(content)
+
+                delta_tool_calls = delta.get("tool_calls")
+                if text_buffer and (
+                    text_buffer_size >= _COALESCE_MAX_CHARS
+                    or choice_finish_reason
+                    or delta_tool_calls
+                ):
+                    event = stream_text("".join(text_buffer))
+                    text_buffer.clear()
+                    text_buffer_size = 0
+                    yield event
         
-            # Look at the end of file for the structure we get as response to understand the intuition of
-            # why we are doing this like this.
-            if delta.tool_calls:
-                # It is a list of tool calls. We iterate over it.
-                for tool_call_delta in delta.tool_calls:
-                    idx = tool_call_delta.index
-
-                    # If the tool call index is not in the tool calls dictionary, then we add it.
-                    # INITIALIZE the box only once (first chunk for this tool call).
-                    if idx not in tool_calls:
-                        tool_calls[idx] = {
-                            "id": tool_call_delta.id or "",
-                            "name": "",
-                            "arguments": "",
-                        }
-
-                    # PROCESS every chunk (runs for ALL chunks, not just the first).
-                    if tool_call_delta.function:
-                        # The name typically only arrives in the very first chunk.
-                        if tool_call_delta.function.name:
-                            tool_calls[idx]["name"] = tool_call_delta.function.name
-                            yield StreamEvent.stream_tool_call_start(
-                                call_id=tool_calls[idx]["id"],
-                                name=tool_call_delta.function.name,
-                            )
+                # Look at the end of file for the structure we get as response to understand the intuition of
+                # why we are doing this like this.
+                if delta_tool_calls:
+                    # It is a list of tool calls. We iterate over it.
+                    for tool_call_delta in delta_tool_calls:
+                        idx = tool_call_delta.get("index", 0)
+
+                        # If the tool call index is not in the tool calls dictionary, then we add it.
+                        # INITIALIZE the box only once (first chunk for this tool call).
+                        tc = get_tool_call(idx)
+                        if tc is None:
+                            tc = tool_calls[idx] = {
+                                "id": tool_call_delta.get("id") or "",
+                                "name": "",
+                                "arguments": [],
+                            }
+
+                        # PROCESS every chunk (runs for ALL chunks, not just the first).
+                        function = tool_call_delta.get("function")
+                        if function:
+                            # The name typically only arrives in the very first chunk.
+                            name = function.get("name")
+                            if name:
+                                tc["name"] = name
+                                yield stream_tool_call_start(
+                                    call_id=tc["id"],
+                                    name=name,
+                                )
                         
-                    # Arguments stream in over multiple chunks — must be outside the 'if idx not in' block.
-                    if tool_call_delta.function.arguments:
-                        tool_calls[idx]["arguments"] += tool_call_delta.function.arguments
-                        yield StreamEvent.stream_tool_call_delta(
-                            call_id=tool_calls[idx]["id"],
-                            name=tool_calls[idx]["name"],
-                            # Pass just this chunk's new piece, not the whole accumulated string.
-                            arguments_delta=tool_call_delta.function.arguments,
-                        )
+                            # Arguments stream in over multiple chunks — must be outside the 'if idx not in' block.
+                            arguments = function.get("arguments")
+                            if arguments:
+                                tc["arguments"].append(arguments)
+                                yield stream_tool_call_delta(
+                                    call_id=tc["id"],
+                                    name=tc["name"],
+                                    # Pass just this chunk's new piece, not the whole accumulated string.
+                                    arguments_delta=arguments,
+                                )
+        except Exception:
+            # The text received before the failure still reaches the consumer, ahead of the error.
+            if text_buffer:
+                yield stream_text("".join(text_buffer))
+                text_buffer.clear()
+            raise
+        finally:
+            if pending is not None and not pending.done():
+                # The consumer stopped while a read was in flight: cancel it, which also ends the chunk reader.
+                pending.cancel()
+                await asyncio.wait((pending,))
+            await chunks.aclose()
+
+        if text_buffer:
+            yield stream_text("".join(text_buffer))
 
         # If the tool call has a name and arguments, then we yield a tool call complete event.
         for idx, tc in tool_calls.items():
-            if tc["name"] and tc["arguments"]:
+            pieces = tc["arguments"]
+            if tc["name"] and pieces:
+                # Now we have to convert the arguments from str to dict but what if the arguments are not valid json?
+                # Hence we are making a parser for it. The arguments are joined and parsed (with orjson when
+                # available) exactly once, when the call is complete: re-parsing the partial JSON as it streams
+                # in would copy and scan the whole prefix again for every piece.
                 yield StreamEvent.stream_tool_call_complete(
                     call_id=tc["id"],
                     name=tc["name"],
-                    # Now we have to convert the arguments from str to dict but what if the arguments are not valid json?
-                    # Hence we are making a parser for it.
-                    arguments=parse_tool_call_arguments(tc["arguments"]),
+                    arguments=parse_tool_call_arguments("".join(pieces)),
                 )
 
         yield StreamEvent.stream_message_complete(
             finish_reason=finish_reason, 
-            usage=usage
+            usage=_usage_from_api(usage),
         )
     
     async def _non_stream_response(
@@ -277,41 +782,25 @@ class LLMClient:
             A StreamEvent containing the complete response and usage stats.
         """
         response = await client.chat.completions.create(**kwargs)
-        choices = response.choices[0]
-        
-        finish_reason = None
-        if choices.finish_reason:
-            finish_reason = choices.finish_reason
-            
-        message = choices.message
-        
-        text_delta = None
-        if message.content:
-            text_delta = TextDelta(message.content)
+        choice = response.choices[0]
+        message = choice.message
+        content = message.content
+        text_delta = TextDelta(content) if content else None
 
         tool_calls: list[ToolCall] = []
         if message.tool_calls:
             for tool_call in message.tool_calls:
                 tool_calls.append(
                     ToolCall(
-                        call_id=tool_call.call_id,
+                        call_id=tool_call.id,
                         name=tool_call.function.name,
                         arguments=parse_tool_call_arguments(tool_call.function.arguments),
                     )
                 )
 
-        usage = None
-        if response.usage:
-            usage = TokenUsage(
-                completion_tokens=response.usage.completion_tokens,
-                prompt_tokens=response.usage.prompt_tokens,
-                total_tokens=response.usage.total_tokens,
-                cached_tokens=response.usage.prompt_tokens_details.cached_tokens,
-            )
-
         return StreamEvent.stream_message_complete(
-            finish_reason=finish_reason,
-            usage=usage,
+            finish_reason=choice.finish_reason,
+            usage=_usage_from_api(response.usage),
             text_delta=text_delta,
         )
 
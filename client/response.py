@@ -11,8 +11,20 @@ from __future__ import annotations # This is so that we can use TokenUsage in it
 from dataclasses import dataclass
 from enum import StrEnum
 from typing import Any
+import json
 
-@dataclass
+# orjson is an optional, much faster (C) JSON parser/serializer (pip install "kraken-code[speedups]").
+# Its JSONDecodeError subclasses json.JSONDecodeError, so callers handle both the same way.
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        """Serializes obj to compact UTF-8 JSON, like orjson.dumps."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+@dataclass(slots=True, frozen=True)
 class TextDelta:
     """
     Represents a small increment of text generated by the LLM.
@@ -34,6 +46,9 @@ class TextDelta:
 class StreamEventType(StrEnum):
     """
     Categorizes the types of events that can occur during an LLM response stream.
+
+    Kept as a StrEnum so the values stay readable in logs and serialized events.
+    The members are singletons, so hot paths compare them with `is`.
     """
     TEXT_DELTA = "text_delta" # Tiny chunks of text arriving
     MESSAGE_COMPLETE = "message_complete" # The full response has arrived
@@ -42,7 +57,7 @@ class StreamEventType(StrEnum):
     TOOL_CALL_DELTA = "tool_call_delta" # A chunk of a tool call was made
     TOOL_CALL_COMPLETE = "tool_call_complete" # A tool call was completed
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """
     Tracks the number of tokens consumed during an LLM interaction.
@@ -69,8 +84,13 @@ class TokenUsage:
             cached_tokens=self.cached_tokens + other.cached_tokens,
         )
 
+    @property
+    def cache_hit_ratio(self) -> float:
+        """The share of prompt tokens served from the provider's prompt cache (0.0 if there were none)."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ToolCallDelta:
     """
     Represents a small increment of a tool call generated by the LLM.
@@ -108,7 +128,7 @@ class ToolCall:
 # StreamEvent acts as a unified schema or class definition for any event that comes from the model. 
 # This makes it easier to process and manage different types of responses consistently.
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StreamEvent:
     """
     A unified event object representing any state change in an LLM response stream.
@@ -116,6 +136,8 @@ class StreamEvent:
     By using a single class for all types of response outcomes, we simplify the
     downstream processing logic in the Agent and UI.
 
+    One event is created per streamed chunk, so it uses slots (no per-instance __dict__).
+
     Attributes:
         type: The category of the stream event.
         text_delta: The text content (if applicable).
@@ -247,12 +269,11 @@ def parse_tool_call_arguments(arguments_str: str) -> dict:
         The arguments of the tool call as a dictionary.
     """
 
-    import json
     if not arguments_str:
         return {}
 
     try:
-        return json.loads(arguments_str)
+        return _json_loads(arguments_str)
     except json.JSONDecodeError as e:
         return {"raw_arguments": arguments_str}
     
@@ -8,15 +8,30 @@ required by LLM APIs.
 
 from dataclasses import field
 from typing import Any
-from utils.text import count_tokens
+from utils.text import count_tokens_fast, get_encoder
+from client.response import TokenUsage
 from prompts.system_prompt import get_system_prompt
 from dataclasses import dataclass
+import hashlib
+import json
+import logging
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-@dataclass
+def _uses_cache_control(model: str | None) -> bool:
+    """
+    Checks whether a model needs explicit cache_control breakpoints for prompt caching.
+
+    Args:
+        model: The model name (e.g., "anthropic/claude-sonnet-4").
+
+    Returns:
+        True for Anthropic models, which only cache marked content. Other providers cache prefixes automatically.
+    """
+    return bool(model) and (model.startswith("anthropic/") or "claude" in model)
+
+@dataclass(slots=True)
 class MessageItem:
     """
     Represents a single message in the conversation history.
@@ -44,17 +59,19 @@ class MessageItem:
             A dictionary containing the role and content of the message.
         """
 
+        # Keys always come in the same order (role, content, tool_call_id, tool_calls), so the serialized
+        # history is byte-for-byte stable from one request to the next and providers can reuse their prompt cache.
         result: dict[str, Any] = {"role": self.role}
 
+        if self.content:
+            result["content"] = self.content
+
         if self.tool_call_id:
             result["tool_call_id"] = self.tool_call_id
 
         if self.tool_calls:
             result["tool_calls"] = self.tool_calls
 
-        if self.content:
-            result["content"] = self.content
-
         return result
     
 
@@ -72,6 +89,55 @@ class ContextManager:
         self._system_prompt = get_system_prompt()
         self._messages: list[MessageItem] = []
         self._model = os.getenv("MODEL")
+        # Resolve the tokenizer once, every message added to the history gets counted with it.
+        self._encoder = get_encoder(self._model)
+        # Hash of the static request prefix (system prompt + tool schemas), see freeze_prefix.
+        self._prefix_hash: str | None = None
+        # The system message and tool schema list that _prefix_hash was computed from.
+        self._prefix_sources: tuple[Any, Any] | None = None
+        # Token usage summed over every completion of the conversation.
+        self.cumulative_usage = TokenUsage()
+        # The API-format history is kept up to date as messages are added, so get_messages()
+        # doesn't have to rebuild (and copy) the whole conversation on every agentic turn.
+        self._api_messages: list[dict[str, Any]] = []
+        if self._system_prompt:
+            self._api_messages.append(self._system_message())
+
+    def _system_message(self) -> dict[str, Any]:
+        """
+        Builds the system message, the static prefix of every request.
+
+        The system prompt never changes and always comes first, so providers with prompt
+        caching can reuse it across turns. Anthropic models (through OpenRouter) only cache
+        what is explicitly marked, so for them the prompt carries a cache breakpoint.
+
+        Returns:
+            The system message dictionary.
+        """
+        if _uses_cache_control(self._model):
+            return {
+                "role": "system",
+                "content": [{
+                    "type": "text",
+                    "text": self._system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            }
+        return {
+            "role": "system",
+            "content": self._system_prompt,
+        }
+
+    def _append(self, item: MessageItem) -> None:
+        """
+        Stores a message in the history and its API-format dictionary in the message list.
+
+        Args:
+            item: The message to add.
+        """
+        self._messages.append(item)
+        # We converted the item which in a MessageItem to dictionary to bridge the internal metadata and external API requirements.
+        self._api_messages.append(item.to_dict())
 
     def add_user_message(self, message: str) -> None:
         """
@@ -83,30 +149,34 @@ class ContextManager:
         item = MessageItem(
             role="user",
             content=message,
-            token_count=count_tokens(message, self._model)
+            token_count=count_tokens_fast(message, self._encoder)
         )
-        self._messages.append(item)
+        self._append(item)
 
     def add_assistant_message(
         self, 
         message: str, 
         tool_calls: list[dict[str, Any]] | None = None,
         # tool_call_results: list[dict[str, Any]] = []
-    ) -> None:
+    ) -> str:
         """
         Adds a new message from the assistant to the conversation history.
 
         Args:
             message: The textual content of the assistant's message.
             tool_calls: The tool calls made by the assistant.
+
+        Returns:
+            The stored message content ("" if there was none), so callers can reuse the same string object.
         """
         item = MessageItem(
             role="assistant",
             content=message or "",
             tool_calls=tool_calls or [],
-            token_count=count_tokens(message or "", self._model)
+            token_count=count_tokens_fast(message or "", self._encoder)
         )
-        self._messages.append(item)
+        self._append(item)
+        return item.content
 
     def add_tool_result(self, tool_call_id: str, content: str) -> None:
         """
@@ -120,9 +190,56 @@ class ContextManager:
             role="tool",
             content=content,
             tool_call_id=tool_call_id,
-            token_count=count_tokens(content, self._model)
+            token_count=count_tokens_fast(content, self._encoder)
+        )
+        self._append(item)
+
+    def freeze_prefix(self, tool_schemas: list[dict[str, Any]] | None) -> str:
+        """
+        Records the static prefix of the requests and warns when it changes.
+
+        Providers only reuse their prompt cache while the start of the request stays
+        exactly the same, and the system prompt and tool definitions are that start.
+        A change (e.g. a regenerated prompt or reordered tools) silently turns every
+        following request into a cache miss, so it is logged.
+
+        The tool registry hands out the same schema list until a tool is (un)registered, so
+        the hash is only recomputed when a different list (or system message) comes in.
+
+        Args:
+            tool_schemas: The tool schemas sent with the requests.
+
+        Returns:
+            The hash of the current prefix.
+        """
+        system_message = self._api_messages[0] if self._system_prompt else None
+        sources = self._prefix_sources
+        if sources is not None and sources[0] is system_message and sources[1] is tool_schemas:
+            return self._prefix_hash
+        prefix_hash = hashlib.sha256(
+            json.dumps([system_message, tool_schemas], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        if self._prefix_hash is not None and prefix_hash != self._prefix_hash:
+            logger.warning("The system prompt / tool schemas changed, the provider prompt cache will miss.")
+        self._prefix_hash = prefix_hash
+        self._prefix_sources = (system_message, tool_schemas)
+        return prefix_hash
+
+    def add_usage(self, usage: TokenUsage) -> None:
+        """
+        Adds the token usage of a completion to the conversation total.
+
+        Args:
+            usage: The token usage reported for the completion.
+        """
+        self.cumulative_usage += usage
+        # The prompt cache hit rate tells whether the stable-prefix ordering of the messages pays off.
+        # Lazy %-formatting: the message is only built when debug logging is on.
+        logger.debug(
+            "Prompt cache hit ratio: %.1f%% this turn, %.1f%% overall",
+            usage.cache_hit_ratio * 100,
+            self.cumulative_usage.cache_hit_ratio * 100,
         )
-        self._messages.append(item)
 
     def get_messages(self) -> list[dict[str, Any]]:
         """
@@ -131,19 +248,9 @@ class ContextManager:
         This includes the system prompt (if present) followed by all 
         user and assistant interactions.
 
+        The returned list is the live history (no copy is made), so it must be treated as read-only.
+
         Returns:
             A list of message dictionaries.
         """
-        messages = []
-
-        if self._system_prompt:
-            messages.append({
-                "role": "system",
-                "content": self._system_prompt,
-            })
-
-        for item in self._messages:
-            # We converted the item which in a MessageItem to dictionary to bridge the internal metadata and external API requirements.
-            messages.append(item.to_dict())
-
-        return messages
+        return self._api_messages
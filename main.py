@@ -6,28 +6,29 @@ handling user input, streaming assistant responses, and managing the application
 """
 
 # Standard Library Imports
+from __future__ import annotations
+import argparse
 import sys
 import os
 import asyncio
+import contextlib
+import logging
 from pathlib import Path
-from typing import Any
-
-# Third-Party Imports
-import click
-import dotenv
+from typing import TYPE_CHECKING, Any, Coroutine
 
 # Local Application Imports
-from UI.TUI import get_console, TUI
-from client.llm_client import LLMClient
-from agent.event import AgentEventType
-from agent.agent import Agent
+from utils.config import check_config, load_config
 
-# Load environment variables
-dotenv.load_dotenv()
+# The UI and the agent (which pull in Rich, Pydantic, the OpenAI SDK, tiktoken, ...) are only
+# needed once there is something to run, so they are imported in CLI instead of here:
+# `--help` and argument errors then don't pay for hundreds of milliseconds of imports.
+if TYPE_CHECKING:
+    from agent.agent import Agent
+    from agent.event import AgentEvent, TextCompleteEvent
 
-# Click natively does not support asynchronous functions.
-# We use this wrapper (middleman/middle function) to pause and wait for the final result, 
-# ensuring Click receives the actual output rather than a raw coroutine object.
+# The entry point is a plain (sync) function: asynchronous functions aren't awaited by the caller.
+# We use a wrapper (middleman/middle function, see _run) to pause and wait for the final result,
+# ensuring the entry point receives the actual output rather than a raw coroutine object.
 
 # How do I know that? Because I ran this program with async def main(), it gave me this as output.
 # H.P@DESKTOP-0COHH16 MINGW64 ~/Desktop/Kraken Code (main)
@@ -35,7 +36,7 @@ dotenv.load_dotenv()
 # sys:1: RuntimeWarning: coroutine 'main' was never awaited
 # RuntimeWarning: Enable tracemalloc to get the object allocation traceback
 
-console = get_console()
+logger = logging.getLogger(__name__)
 
 class CLI:
     """
@@ -46,21 +47,77 @@ class CLI:
     """
     def __init__(self):
         """Initializes the CLI with an Agent (initially None) and a TUI instance."""
+        from UI.TUI import get_console, TUI
+        from agent.event import AgentEventType
+
         self.agent : Agent | None = None
-        self.tui = TUI(console=console)
+        self._stack: contextlib.AsyncExitStack | None = None # Owns the running Agent (see start).
+        self.console = get_console()
+        self.tui = TUI(console=self.console)
+        # Per-message rendering state, reset by _process_message.
+        self._assistant_streaming = False
+        self._final_response: str | None = None
+        # Event type -> handler, built once so each event costs one dict lookup instead of an if/elif cascade.
+        # TEXT_DELTA isn't in here: it is the per-token event, handled inline in _process_message.
+        # Event types without a handler (agent start/end) are ignored.
+        self._text_delta = AgentEventType.TEXT_DELTA
+        self._handlers = {
+            AgentEventType.TEXT_COMPLETE: self._on_text_complete,
+            AgentEventType.AGENT_ERROR: self._on_error,
+            AgentEventType.TOOL_CALL_START: self._on_tool_start,
+            AgentEventType.TOOL_CALL_COMPLETE: self._on_tool_complete,
+        }
+
+    async def start(self) -> None:
+        """
+        Starts the Agent, if it isn't running yet.
+
+        The Agent (and the connections it opens) then serves every following message
+        until close() is called, instead of being set up again per message.
+        """
+        if self.agent is not None:
+            return
+        from agent.agent import Agent
+
+        self._stack = contextlib.AsyncExitStack()
+        self.agent = await self._stack.enter_async_context(Agent())
+
+    async def close(self) -> None:
+        """Shuts the Agent down, if it is running."""
+        # A flush scheduled on the event loop never runs once asyncio.run() returns, print the text now.
+        self.tui.flush()
+        if self._stack is None:
+            return
+        stack, self._stack = self._stack, None
+        self.agent = None
+        await stack.aclose()
+
+    async def __aenter__(self) -> CLI:
+        """Asynchronous context manager entry, starts the Agent."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Asynchronous context manager exit, shuts the Agent down."""
+        await self.close()
 
     async def run_single(self, message: str) -> str | None:
         """
         Runs a single interaction cycle with the Agent.
 
+        Reuses the running Agent if the CLI was started (see start() or `async with cli:`),
+        otherwise starts one for this message only.
+
         Args:
             message: The user's input prompt.
 
         Returns:
             The final textual response from the assistant, or None if failed.
         """
-        async with Agent() as agent:
-            self.agent = agent
+        if self.agent is not None:
+            return await self._process_message(message)
+
+        async with self:
             return await self._process_message(message)
 
     async def run_interactive(self) -> str | None:
@@ -69,6 +126,7 @@ class CLI:
 
         This method allows the user to continuously interact with the Agent
         by entering prompts and receiving responses until the user decides to exit.
+        One Agent serves the whole session.
 
         Returns:
             The final textual response from the assistant, or None if failed.
@@ -82,23 +140,27 @@ class CLI:
             ]
         )
 
-        async with Agent() as agent:
-            self.agent = agent
-            
+        # Only shut the Agent down at the end if it was started here.
+        owns_agent = self.agent is None
+        await self.start()
+        try:
             while True:
                 try:
-                    user_input = console.input("[cyan bold]❯ [/cyan bold]").strip()
+                    user_input = self.console.input("[cyan bold]❯ [/cyan bold]").strip()
                     if not user_input:
                         continue
 
                     await self._process_message(user_input)
 
                 except KeyboardInterrupt:
-                    console.print("\n[dim]Use /exit to quit[\dim]")
+                    self.console.print("\n[dim]Use /exit to quit[\dim]")
                 except EOFError:
                     break
+        finally:
+            if owns_agent:
+                await self.close()
 
-        console.print("\n[dim]Exiting Kraken Code...[/dim]")
+        self.console.print("\n[dim]Exiting Kraken Code...[/dim]")
 
     def _get_tool_kind(self, tool_name: str) -> str | None:
         """
@@ -132,51 +194,72 @@ class CLI:
         if not self.agent:
             return None
 
-        assistant_streaming = False
-        final_response: str | None = None
+        self._assistant_streaming = False
+        self._final_response = None
+        # Event tracing for debugging, checked once per message instead of formatting every event.
+        trace_events = logger.isEnabledFor(logging.DEBUG)
+        # The per-token branch is a local load and a pointer compare: every event carries
+        # the AgentEventType constant object itself, so `is` is exact.
+        text_delta = self._text_delta
+        stream_assistant = self.tui.stream_assistant_messages
+        handlers = self._handlers
 
         async for event in self.agent.run(message):
-            # print(event)
-            if event.type == AgentEventType.TEXT_DELTA:
-                content = event.data.get("content", "")
-                if not assistant_streaming:
+            if trace_events:
+                logger.debug("Agent event: %r", event)
+            event_type = event.type
+            if event_type is text_delta:
+                if not self._assistant_streaming:
                     self.tui.begin_assitant()
-                    assistant_streaming = True
-                self.tui.stream_assistant_messages(content)
-
-            elif event.type == AgentEventType.TEXT_COMPLETE:
-                final_response = event.data.get("content", "")
-                if assistant_streaming:
-                    self.tui.end_assistant()
-                    assistant_streaming = False
-            
-            elif event.type == AgentEventType.AGENT_ERROR:
-                error = event.data.get("error", "Unknown error occured.")
-                console.print(f'[error]Error: {error}[/error]')
-
-            elif event.type == AgentEventType.TOOL_CALL_START:
-                tool_name = event.data.get("name", "Unknown tool")
-                self.tui.tool_call_start(
-                    call_id=event.data.get("call_id", ""),
-                    name=tool_name,
-                    tool_kind=self._get_tool_kind(tool_name),
-                    arguments=event.data.get("arguments", {}),
-                )
-
-            elif event.type == AgentEventType.TOOL_CALL_COMPLETE:
-                tool_name = event.data.get("name", "Unknown tool")
-                self.tui.tool_call_complete(
-                    call_id=event.data.get("call_id", ""),
-                    name=tool_name,
-                    tool_kind=self._get_tool_kind(tool_name),
-                    success=event.data.get("success", False),
-                    output=event.data.get("output", ""),
-                    error=event.data.get("error", None),
-                    metadata=event.data.get("metadata", None),
-                    truncated=event.data.get("truncated", False),
-                )
-
-        return final_response
+                    self._assistant_streaming = True
+                stream_assistant(event.content)
+                continue
+
+            handler = handlers.get(event_type)
+            if handler is not None:
+                handler(event)
+
+        return self._final_response
+
+    def _on_text_complete(self, event: TextCompleteEvent) -> None:
+        """Records the final response and closes the assistant's message panel."""
+        self._final_response = event.content
+        if self._assistant_streaming:
+            self.tui.end_assistant()
+            self._assistant_streaming = False
+
+    def _on_error(self, event: AgentEvent) -> None:
+        """Prints an error reported by the Agent, after whatever part of the answer already came in."""
+        error = event.data.get("error", "Unknown error occured.")
+        # The TUI buffers streamed text, close the assistant's message first so the error isn't printed above it.
+        if self._assistant_streaming:
+            self.tui.end_assistant()
+            self._assistant_streaming = False
+        self.console.print(f'[error]Error: {error}[/error]')
+
+    def _on_tool_start(self, event: AgentEvent) -> None:
+        """Shows a tool call that is about to run."""
+        tool_name = event.data.get("name", "Unknown tool")
+        self.tui.tool_call_start(
+            call_id=event.data.get("call_id", ""),
+            name=tool_name,
+            tool_kind=self._get_tool_kind(tool_name),
+            arguments=event.data.get("arguments", {}),
+        )
+
+    def _on_tool_complete(self, event: AgentEvent) -> None:
+        """Shows the result of a finished tool call."""
+        tool_name = event.data.get("name", "Unknown tool")
+        self.tui.tool_call_complete(
+            call_id=event.data.get("call_id", ""),
+            name=tool_name,
+            tool_kind=self._get_tool_kind(tool_name),
+            success=event.data.get("success", False),
+            output=event.data.get("output", ""),
+            error=event.data.get("error", None),
+            metadata=event.data.get("metadata", None),
+            truncated=event.data.get("truncated", False),
+        )
 
 # wrapper function to pause and wait for the final result
 # async def run(
@@ -184,27 +267,72 @@ class CLI:
 # ):
 
 
-@click.command()
-@click.argument("prompt", required=False) # We don't want to always pass a prompt; sometimes we just want to run without a prompt.
-def main(
-    prompt: str | None = None
-):
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Runs a coroutine to completion on a new event loop.
+
+    The loop is a uvloop one when uvloop is installed (pip install "kraken-code[speedups]", not on Windows):
+    a drop-in replacement for the pure Python asyncio event loop (libuv + Cython), noticeably faster for
+    I/O heavy work like ours. uvloop.run() creates the loop itself, so no global event loop policy is
+    changed (policies are deprecated as of Python 3.14).
+
+    On Python 3.12+ the loop uses the eager task factory: a task that finishes without
+    ever suspending (e.g. a cached or already resolved await) completes right away
+    instead of making a round trip through the scheduler.
+
+    Args:
+        coro: The coroutine to run.
+
+    Returns:
+        The result of the coroutine.
+    """
+    async def _entry() -> Any:
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        return await coro
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(_entry())
+    return uvloop.run(_entry())
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Main entry point for the Kraken Code CLI.
+
+    The command line is a single optional prompt, so it's parsed with the standard
+    library's argparse rather than click, which is cheaper to import on every start.
     
     Args:
-        prompt: An optional initial user prompt to process.
+        argv: The command line arguments, sys.argv[1:] when None.
     """
+    parser = argparse.ArgumentParser(description="Kraken Code CLI.")
+    # We don't want to always pass a prompt; sometimes we just want to run without a prompt (interactive mode).
+    parser.add_argument("prompt", nargs="?", default=None, help="A prompt to run once, interactive mode if omitted.")
+    prompt: str | None = parser.parse_args(argv).prompt
+
+    if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
+        # On Windows stdout defaults to flushing on every write, the console flushes after each print (streamed batch) instead.
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
+    # Load environment variables (the .env file), before anything reads a setting.
+    load_config()
+    config_error = check_config()
+    if config_error:
+        # sys.exit() with a message prints it to stderr and exits with status 1.
+        sys.exit(f"Error: {config_error}")
     cli = CLI()
     # messages = [
     #     {"role": "user", "content": prompt}
     # ]
     if prompt:
-        result = asyncio.run(cli.run_single(prompt))
+        result = _run(cli.run_single(prompt))
         if result is None:
             sys.exit(1)
     else:
-        asyncio.run(cli.run_interactive())
+        _run(cli.run_interactive())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -16,16 +16,36 @@ that the agent can use to interact with the environment.
 # from which ANY provider-specific schema can be generated.
 
 from __future__ import annotations
-from pydantic.json_schema import model_json_schema
 from pydantic import ValidationError
-from dataclasses import field
 from pathlib import Path
 from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, ClassVar
 from enum import StrEnum
+import functools
 import abc
 
+@functools.lru_cache(maxsize=None)
+def _accepts_empty_params(schema: type[BaseModel]) -> bool:
+    """
+    Checks (once per schema class) whether a tool schema accepts an empty params dict.
+
+    Validating {} once, through the public API, covers everything that could reject it:
+    required fields, validated defaults and model / field validators.
+
+    Args:
+        schema: The Pydantic model of a tool's parameters.
+
+    Returns:
+        True if {} validates against the schema.
+    """
+    try:
+        schema.model_validate({})
+    except Exception:
+        # A ValidationError, or anything else a custom validator raises: let validate_params report it.
+        return False
+    return True
+
 class ToolKind(StrEnum):
     """
     Categorizes tools based on their primary interaction type.
@@ -40,30 +60,45 @@ class ToolKind(StrEnum):
     MEMORY = "memory"
     MCP = "mcp"
 
-@dataclass
+# The kinds of tools that can change the state of the system (see Tool.is_mutating).
+# Built once, so a check is a hashed lookup instead of building and scanning a tuple on every call.
+_MUTATING_KINDS = frozenset({
+    ToolKind.WRITE,
+    ToolKind.SHELL,
+    ToolKind.NETWORK,
+    ToolKind.MEMORY,
+})
+
+@dataclass(slots=True)
 class ToolResult:
     """
     Encapsulates the outcome of a tool execution.
 
+    One is created per tool call, so it uses slots (no per-instance __dict__), like the
+    other per-call tool dataclasses below.
+
     Attributes:
         success: Whether the tool executed successfully.
         output: The primary textual output or result of the tool.
         error: A descriptive error message if success is False.
-        metadata: Additional structured data returned by the tool (e.g., file stats).
+        metadata: Additional structured data returned by the tool (e.g., file stats), None if there is none.
         truncated: Whether the output was truncated.
     """
     success: bool
     output: str
     error: str | None = None
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None # No dict is allocated for results without metadata.
     truncated: bool = False
 
+    # The factories take the remaining fields as explicit keywords instead of **kwargs,
+    # so creating a result (once per tool call) doesn't build an intermediate kwargs dict.
     @classmethod
     def error_result(
         cls,
         error: str,
         output: str="",
-        **kwargs
+        metadata: dict[str, Any] | None = None,
+        truncated: bool = False,
     ) -> ToolResult:
         """
         Creates an error result.
@@ -71,27 +106,43 @@ class ToolResult:
         Args:
             error: The error message.
             output: The output of the tool.
+            metadata: Additional structured data about the error.
+            truncated: Whether the output was truncated.
         Returns:
             ToolResult: An error result.
         """
-        return cls(success=False, error=error, output=output, **kwargs)
+        return cls(success=False, output=output, error=error, metadata=metadata, truncated=truncated)
 
     @classmethod
     def success_result(
         cls,
         output: str = "",
-        **kwargs
+        metadata: dict[str, Any] | None = None,
+        truncated: bool = False,
     ) -> ToolResult:
         """
         Creates a success result.
 
         Args:
             output: The output of the tool.
-            **kwargs: Additional keyword arguments.
+            metadata: Additional structured data returned by the tool.
+            truncated: Whether the output was truncated.
         Returns:
             ToolResult: A success result.
         """
-        return cls(success=True, output=output, error=None, **kwargs)
+        return cls(success=True, output=output, error=None, metadata=metadata, truncated=truncated)
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """
+        Sets one metadata entry, creating the metadata dict on first use.
+
+        Args:
+            key: The metadata key.
+            value: The value to store.
+        """
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[key] = value
 
     # This is for formatting the output in a format the model will like/easy to parse.
     def to_model_output(self) -> str:
@@ -101,7 +152,7 @@ class ToolResult:
         else:
             return f"Error: {self.error}\n\nOutput:\n{self.output}"
 
-@dataclass
+@dataclass(slots=True)
 class ToolInvokation:
     """
     Represents a specific request to run a tool with given parameters.
@@ -113,7 +164,7 @@ class ToolInvokation:
     params: dict[str, Any]
     cwd: Path
 
-@dataclass
+@dataclass(slots=True)
 class ToolConfirmation:
     tool_name: str
     params: dict[str, Any]
@@ -136,23 +187,31 @@ class Tool(abc.ABC):
     description: str = "Base tool"
     kind: ToolKind = ToolKind.READ
 
-    def __init__(self) -> None:
-        """Initializes the tool instance."""
-        pass
+    # Defines the expected parameter structure for the tool: either a Pydantic BaseModel class
+    # for internal tools or a dictionary representing a JSON schema for external MCP tools.
+    # BaseModel/Pydantic is when we will be defining our own schema for MCP tools -> in-built tools.
+    # dict[str, Any] is when we will be calling external MCP ones, as they will be output in JSON format not pydantic model.
+    # Due to the fact that we are using pydantic models, we can use pydantic validators to validate the params.
+    # It's a plain class attribute (set by each subclass), not a property: reading it is a dict lookup
+    # instead of a descriptor call, and it's read on every validation.
+    schema: ClassVar[dict[str, Any] | type[BaseModel]]
 
-    @property
-    def schema(self) -> dict[str, Any] | type["BaseModel"]:
+    def __init_subclass__(cls, **kwargs: Any) -> None:
         """
-        Defines the expected parameter structure for the tool.
+        Checks that every concrete tool defines its schema.
 
-        Returns:
-            Either a Pydantic BaseModel class for internal tools or a 
-            dictionary representing a JSON schema for external MCP tools.
+        Intermediate base classes (those that don't implement execute yet) are skipped.
+
+        Raises:
+            TypeError: If a tool implementing execute has no schema.
         """
-        # BaseModel/Pydantic is when we will be defining our own schema for MCP tools -> in-built tools.
-        # dict[str, Any] is when we will be calling external MCP ones, as they will be output in JSON format not pydantic model.
-        # Due to the fact that we are using pydantic models, we can use pydantic validators to validate the params.
-        raise NotImplementedError("The tool must define schema property or class attribute.")
+        super().__init_subclass__(**kwargs)
+        if cls.execute is not Tool.execute and not hasattr(cls, "schema"):
+            raise TypeError(f"Tool {cls.__name__} must define a schema (class attribute or property).")
+
+    def __init__(self) -> None:
+        """Initializes the tool instance."""
+        pass
 
     @abc.abstractmethod # Method must be implemented by subclasses.
     async def execute(self, invocation: ToolInvokation) -> ToolResult:
@@ -181,16 +240,20 @@ class Tool(abc.ABC):
         # Error handling for pydantic models
         schema = self.schema
         if isinstance(schema, type) and issubclass(schema, BaseModel):
+            # No-argument calls of tools without required params don't need Pydantic at all.
+            if not params and _accepts_empty_params(schema):
+                return []
             try:
-                schema(**params)
+                # model_validate hands the dict straight to the compiled pydantic-core validator,
+                # without binding every param as a keyword argument of __init__ first.
+                schema.model_validate(params)
             except ValidationError as e:
-                errors = []
-                for error in e.errors():
-                    field = '.'.join(str(x) for x in error.get("loc", []))
-                    msg = error.get("msg", "Validation Error")
-                    errors.append(f"Parameter '{field}': {msg}")
-
-                return errors
+                # One comprehension with map(str, ...) (C-level) instead of appends and a generator per field.
+                # include_url=False: the documentation links of the errors are never shown, so don't build them.
+                return [
+                    f"Parameter '{'.'.join(map(str, error.get('loc') or ()))}': {error.get('msg', 'Validation Error')}"
+                    for error in e.errors(include_url=False)
+                ]
             except Exception as e:
                 return [str(e)]
 
@@ -202,17 +265,12 @@ class Tool(abc.ABC):
         Checks if the tool execution will modify the state of the system.
 
         Args:
-            params: The parameters for the tool call.
+            params: The parameters for the tool call (unused here, subclasses may decide based on them).
 
         Returns:
             True if the tool is of a mutating kind (WRITE, SHELL, etc.).
         """
-        return self.kind in (
-            ToolKind.WRITE, 
-            ToolKind.SHELL, 
-            ToolKind.NETWORK, 
-            ToolKind.MEMORY
-        )
+        return self.kind in _MUTATING_KINDS
 
     async def get_confirmation(self, invocation: ToolInvokation) -> ToolConfirmation | None:
         """
@@ -237,12 +295,22 @@ class Tool(abc.ABC):
         """
         Converts the tool's schema to a format compatible with the OpenAI API.
 
+        The schema is built once per tool instance and then reused: name, description and
+        schema don't change after a tool is created, and generating the JSON schema with
+        Pydantic is not cheap. The same dict is returned every time, so callers must not modify it.
+
         Returns:
             A dictionary representing the tool's schema in OpenAI format.
         """
+        return self._openai_schema
+
+    # cached_property stores the result on the instance on first access (Tool has no __slots__).
+    @functools.cached_property
+    def _openai_schema(self) -> dict[str, Any]:
+        """The tool's schema in OpenAI format, built on first access (see to_openai_schema)."""
         schema = self.schema
         if isinstance(schema, type) and issubclass(schema, BaseModel):
-            json_schema = model_json_schema(schema, mode='serialization')
+            json_schema = schema.model_json_schema(mode="serialization")
             return {
                 "name": self.name,
                 "description": self.description,
@@ -264,7 +332,10 @@ class Tool(abc.ABC):
             else:
                 result["parameters"] = schema
 
-        raise ValueError(f"Invalid schema type for tool {self.name}: {type(schema)}")
+            return result
+
+        else:
+            raise ValueError(f"Invalid schema type for tool {self.name}: {type(schema)}")
 
     
 """
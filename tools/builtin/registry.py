@@ -12,6 +12,8 @@ class ToolRegistry:
     """
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        # The schemas of the registered tools, built on first use and dropped when the tools change.
+        self._schemas: list[dict[str, Any]] | None = None
 
     def register(self, tool: Tool) -> None:
         """
@@ -27,6 +29,7 @@ class ToolRegistry:
             logger.warning(f"Overwrite existing tool: {tool.name}")
             
         self._tools[tool.name] = tool
+        self._schemas = None
         logger.debug(f"Registered tool: {tool.name}")
 
     def unregister(self, name: str) -> bool:
@@ -41,6 +44,7 @@ class ToolRegistry:
         """
         if name in self._tools:
             del self._tools[name]
+            self._schemas = None
             logger.debug(f"Unregistered tool: {name}")
             return True
         return False
@@ -52,19 +56,21 @@ class ToolRegistry:
         Returns:
             A list of tools.
         """
-        tools: list[Tool] = []
-        for tool in self._tools.values():
-            tools.append(tool)
-        return tools
+        return list(self._tools.values())
 
     def get_schemas(self) -> list[dict[str, Any]]:
         """
         Returns a list of tool schemas.
 
+        The list is built once and reused until a tool is registered or unregistered, so
+        every agent turn gets the same list (callers must not modify it).
+
         Returns:
             A list of tool schemas.
         """
-        return [tool.to_openai_schema() for tool in self.get_tools()]
+        if self._schemas is None:
+            self._schemas = [tool.to_openai_schema() for tool in self._tools.values()]
+        return self._schemas
 
     def get(self, name: str) -> Tool | None:
         """
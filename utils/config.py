@@ -0,0 +1,39 @@
+"""
+This module loads the Kraken Code configuration.
+
+Settings (MODEL, OPENROUTER_API_KEY, MAX_RETRIES, ...) are read from the environment.
+A `.env` file is loaded into it once, by the entry point, instead of as an import side
+effect of every module that reads a setting.
+"""
+
+import os
+
+import dotenv
+
+_loaded = False
+
+def load_config() -> None:
+    """
+    Loads the `.env` file into the environment, once per process.
+
+    Variables that are already set in the environment are left as they are.
+    """
+    global _loaded
+    if _loaded:
+        return
+    dotenv.load_dotenv()
+    _loaded = True
+
+def check_config() -> str | None:
+    """
+    Checks that the settings without a usable default are set.
+
+    Called by the entry point right after load_config(), so a missing setting is reported
+    as a plain message before anything starts, not as a traceback on the first request.
+
+    Returns:
+        A message describing the first missing setting, or None if the configuration is complete.
+    """
+    if not os.getenv("MODEL"):
+        return "The MODEL environment variable is not set, it must name the model to use (e.g. in the .env file)."
+    return None
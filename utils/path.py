@@ -1,5 +1,9 @@
 from pathlib import Path
 
+# How many bytes from the start of a file are checked by is_binary_file.
+# 64 KiB still is a single read, and catches binary files whose first null byte comes after a text-like header.
+_BINARY_SNIFF_SIZE = 64 * 1024
+
 def resolve_path(base: str | Path, path: str | Path) -> Path:
     """
     Resolves a path relative to a base directory.
@@ -49,8 +53,10 @@ def is_binary_file(path: str | Path) -> bool:
         True if the file is binary, False otherwise.
     """
     try:
-        with open(path, 'rb') as f:
-            chunk = f.read(8192)
+        # Unbuffered: the sniff is a single read, so a BufferedReader would only add its own
+        # buffer and an extra copy. The `in` check on bytes is a C-level memchr scan.
+        with open(path, 'rb', buffering=0) as f:
+            chunk = f.read(_BINARY_SNIFF_SIZE)
             return b'\x00' in chunk # "\x00" is a null byte, if it is present in the file, it is a binary file.
     except Exception:
         return False
\ No newline at end of file
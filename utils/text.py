@@ -5,13 +5,90 @@ It includes functions for tokenizing text and counting tokens, which are essenti
 for managing LLM context windows and calculating costs.
 """
 
+from __future__ import annotations
+from pathlib import Path
+from typing import Protocol
+import functools
+import logging
+import os
 import tiktoken
 
-def get_tokenizer(model: str):
+# HuggingFace tokenizers is an optional tokenizer backend (Rust, parallel batch encoding), used
+# instead of tiktoken when KRAKEN_TOKENIZER names a tokenizer (see get_encoder).
+try:
+    from tokenizers import Tokenizer
+except ImportError:
+    Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+# How many lines truncate_lines hands to the tokenizer per batch call.
+_TOKENIZE_BATCH_LINES = 1024
+
+class Encoder(Protocol):
     """
-    Retrieves the appropriate tokenizer for a given model.
+    The part of a tokenizer used by Kraken Code, as provided by tiktoken.Encoding.
+    """
+    def encode_ordinary(self, text: str) -> list[int]: ...
+
+    def encode_ordinary_batch(self, text: list[str]) -> list[list[int]]: ...
+
+    def decode(self, tokens: list[int], errors: str = "replace") -> str: ...
+
+class _HFEncoder:
+    """
+    Adapts a HuggingFace tokenizers.Tokenizer to the Encoder interface.
+
+    Attributes:
+        name: The name or path the tokenizer was loaded from.
+    """
+    def __init__(self, tokenizer: Tokenizer, name: str) -> None:
+        """Wraps a loaded tokenizer."""
+        self._tokenizer = tokenizer
+        self.name = name
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        """Encodes a text, without adding any special tokens."""
+        return self._tokenizer.encode(text, add_special_tokens=False).ids
 
-    Attempts to find a model-specific encoding using tiktoken. Falls back 
+    def encode_ordinary_batch(self, text: list[str]) -> list[list[int]]:
+        """Encodes several texts at once (in parallel, in Rust), without adding any special tokens."""
+        return [encoding.ids for encoding in self._tokenizer.encode_batch(text, add_special_tokens=False)]
+
+    def decode(self, tokens: list[int], errors: str = "replace") -> str:
+        """Decodes tokens back to text (errors is accepted for compatibility, the tokenizer handles invalid bytes itself)."""
+        return self._tokenizer.decode(tokens)
+
+def _load_hf_encoder(name: str) -> _HFEncoder | None:
+    """
+    Loads the HuggingFace tokenizer named by KRAKEN_TOKENIZER.
+
+    Args:
+        name: A local tokenizer.json path or a tokenizer name on the HuggingFace Hub.
+
+    Returns:
+        The tokenizer, or None if the tokenizers package isn't installed or loading failed.
+    """
+    if Tokenizer is None:
+        logger.warning("KRAKEN_TOKENIZER is set but the tokenizers package isn't installed, using tiktoken.")
+        return None
+    try:
+        if Path(name).is_file():
+            return _HFEncoder(Tokenizer.from_file(name), name)
+        return _HFEncoder(Tokenizer.from_pretrained(name), name)
+    except Exception as e:
+        logger.warning("Could not load tokenizer %r (%s), using tiktoken.", name, e)
+        return None
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(model: str) -> Encoder:
+    """
+    Retrieves the appropriate encoding for a given model, resolving it only once per model.
+
+    If KRAKEN_TOKENIZER is set (a HuggingFace tokenizer name or a tokenizer.json path) and the
+    optional tokenizers package is installed, that tokenizer is used: it is faster on large
+    texts, but counts are only exact if it matches the model's own tokenizer.
+    Otherwise, attempts to find a model-specific encoding using tiktoken. Falls back 
     to the "cl100k_base" encoding (used by GPT-4 and others) if the specific 
     model is not recognized.
 
@@ -19,14 +96,48 @@ def get_tokenizer(model: str):
         model: The name of the model (e.g., "gpt-4", "claude-3-opus").
 
     Returns:
-        The encode method of the selected tokenizer.
+        The selected encoding.
     """
+    tokenizer_name = os.getenv("KRAKEN_TOKENIZER")
+    if tokenizer_name:
+        encoder = _load_hf_encoder(tokenizer_name)
+        if encoder is not None:
+            return encoder
+
     try:
-        encoding = tiktoken.encoding_for_model(model)
-        return encoding.encode 
+        return tiktoken.encoding_for_model(model)
     except Exception:
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return encoding.encode
+        return tiktoken.get_encoding("cl100k_base")
+
+def get_tokenizer(model: str):
+    """
+    Retrieves the appropriate tokenizer for a given model.
+
+    Args:
+        model: The name of the model (e.g., "gpt-4", "claude-3-opus").
+
+    Returns:
+        The encode_ordinary method of the selected tokenizer (see get_encoder).
+    """
+    return get_encoder(model).encode_ordinary
+
+def count_tokens_fast(text: str, encoder: Encoder) -> int:
+    """
+    Counts the tokens of a text with an already resolved encoding.
+
+    For callers that count many strings for the same model (e.g. the ContextManager),
+    this skips resolving the tokenizer on every call.
+
+    Args:
+        text: The string to count tokens for.
+        encoder: The encoding to use (see get_encoder).
+
+    Returns:
+        The number of tokens in the text.
+    """
+    # encode_ordinary treats special-token text (e.g. "<|endoftext|>" inside a file) as plain text:
+    # it skips the special-token scan of encode (faster), and encode would raise on such text anyway.
+    return len(encoder.encode_ordinary(text or ""))
 
 def count_tokens(text: str, model: str) -> int:
     """
@@ -42,12 +153,54 @@ def count_tokens(text: str, model: str) -> int:
     Returns:
         The number of tokens in the text.
     """
-    tokenizer = get_tokenizer(model)
-    if tokenizer:
-        return len(tokenizer(text or ""))
+    encoder = get_encoder(model)
+    if encoder:
+        return count_tokens_fast(text, encoder)
         
     return estimate_tokens(text)
 
+def exceeds_tokens(text: str, max_tokens: int, model: str) -> bool:
+    """
+    Checks whether a text is longer than a token limit.
+
+    Short texts are answered without tokenizing when the tokenizer is a tiktoken encoding (see _fits_by_length).
+
+    Args:
+        text: The text to check.
+        max_tokens: The token limit.
+        model: The model name to determine the tokenization scheme.
+
+    Returns:
+        True if the text has more than max_tokens tokens.
+    """
+    encoder = get_encoder(model)
+    if _fits_by_length(text, max_tokens, encoder):
+        return False
+
+    return count_tokens_fast(text, encoder) > max_tokens
+
+def _fits_by_length(text: str, max_tokens: int, encoder: Encoder) -> bool:
+    """
+    Checks, without tokenizing, whether a text is too short to have more than max_tokens tokens.
+
+    Every tiktoken (byte-level BPE) token covers at least one UTF-8 byte, so a text of at most
+    max_tokens bytes always fits. That doesn't hold for other tokenizers: SentencePiece ones
+    (e.g. through _HFEncoder) add tokens of their own, like the "▁" word prefix or byte fallbacks,
+    so for them the byte length proves nothing and the text is always tokenized.
+
+    Args:
+        text: The text to check.
+        max_tokens: The token limit.
+        encoder: The encoding the tokens are counted with (see get_encoder).
+
+    Returns:
+        True if the text certainly fits, False if it has to be tokenized to know.
+    """
+    if not isinstance(encoder, tiktoken.Encoding):
+        return False
+    # isascii() is O(1) (a flag of the str object), and then the length in characters is the length in bytes.
+    return len(text) <= max_tokens and (text.isascii() or len(text.encode("utf-8")) <= max_tokens)
+
 def estimate_tokens(text: str) -> int:
     """
     Provides a rough estimate of the number of tokens in a string.
@@ -82,8 +235,7 @@ def truncate_text(
     Returns:
         The truncated text.
     """
-    current_tokens = count_tokens(text, model)
-    if current_tokens <= max_tokens:
+    if not exceeds_tokens(text, max_tokens, model):
         return text
 
     suffix_tokens = count_tokens(suffix, model)
@@ -97,6 +249,68 @@ def truncate_text(
     else:
         return _truncate_by_chars(text, target_tokens, model, suffix)
 
+def truncate_lines(
+    lines: list[str],
+    max_tokens: int,
+    model: str,
+    suffix: str = "\n...[Truncated]",
+) -> tuple[str, bool]:
+    """
+    Joins lines with newlines, truncated (at a line boundary) to a maximum token limit.
+
+    Unlike joining and then calling truncate_text, which tokenizes the whole text to find out
+    that it's too long and then again to cut it, this tokenizes the lines once, in batches,
+    and stops as soon as the limit is passed: the lines after it are never tokenized.
+
+    Args:
+        lines: The lines of the text (without line endings).
+        max_tokens: The maximum number of tokens.
+        model: The model name.
+        suffix: The suffix to append to truncated text.
+
+    Returns:
+        The (possibly truncated) text, and whether it was truncated.
+    """
+    text = "\n".join(lines)
+    encoder = get_encoder(model)
+    if _fits_by_length(text, max_tokens, encoder):
+        return text, False
+
+    target_tokens = max_tokens - count_tokens_fast(suffix, encoder)
+    # Counted per line with its newline, like _truncate_by_lines. Splitting at the line ends can
+    # only prevent merges, so this never counts fewer tokens than the joined text (never under-truncates).
+    total_tokens = 0
+    kept_lines = 0 # The lines that fit in target_tokens (final once the limit is passed).
+    first_line_tokens: list[int] = [] # Kept for the fallback, when not even the first line fits.
+    exceeded = False
+
+    for batch_start in range(0, len(lines), _TOKENIZE_BATCH_LINES):
+        batch = lines[batch_start:batch_start + _TOKENIZE_BATCH_LINES]
+        batch_tokens = encoder.encode_ordinary_batch([line + "\n" for line in batch])
+        if batch_start == 0 and batch_tokens:
+            first_line_tokens = batch_tokens[0]
+        for tokens in batch_tokens:
+            total_tokens += len(tokens)
+            if total_tokens < target_tokens:
+                kept_lines += 1
+            if total_tokens > max_tokens:
+                exceeded = True
+                break
+        if exceeded:
+            break
+
+    if not exceeded:
+        return text, False
+
+    if target_tokens <= 0:
+        return suffix.strip(), True
+
+    if not kept_lines:
+        # Fallback to character truncation if have no complete line. 
+        return _cut_first_line(encoder, first_line_tokens, target_tokens, suffix), True
+
+    return "\n".join(lines[:kept_lines]) + suffix, True
+
 def _truncate_by_lines(text: str, target_tokens: int, model: str, suffix: str) -> str:
     """
     Truncates text by lines to a maximum token limit.
@@ -111,26 +325,51 @@ def _truncate_by_lines(text: str, target_tokens: int, model: str, suffix: str) -
         The truncated text.
     """
     lines = text.split('\n')
-    result_lines: list[str] = []
+    # All the lines are tokenized in one batch call (run in Rust, across threads) instead of one
+    # tokenizer call per line, then the kept lines are found by summing up their token counts.
+    encoder = get_encoder(model)
+    line_tokens = encoder.encode_ordinary_batch([line + '\n' for line in lines])
+    kept_lines = 0
     current_tokens = 0
 
-    for line in lines:
-        line_tokens = count_tokens(line + '\n', model)
-        if current_tokens + line_tokens >= target_tokens:
+    for tokens in line_tokens:
+        current_tokens += len(tokens)
+        if current_tokens >= target_tokens:
             break
-        result_lines.append(line)
-        current_tokens += line_tokens
+        kept_lines += 1
 
+    result_lines = lines[:kept_lines]
     if not result_lines:
         # Fallback to character truncation if have no complete line. 
-        return _truncate_by_chars(text, target_tokens, model, suffix)
+        return _cut_first_line(encoder, line_tokens[0], target_tokens, suffix)
     
     return '\n'.join(result_lines) + suffix
 
+def _cut_first_line(encoder: Encoder, first_line_tokens: list[int], target_tokens: int, suffix: str) -> str:
+    """
+    Cuts the first line of a text at a token limit, for when not even that line fits.
+
+    Decodes a slice of the tokens the line-truncation already computed for that line,
+    instead of tokenizing the text again.
+
+    Args:
+        encoder: The encoding the tokens come from.
+        first_line_tokens: The tokens of the first line (with its newline).
+        target_tokens: The maximum number of tokens.
+        suffix: The suffix to append to truncated text.
+
+    Returns:
+        The truncated text.
+    """
+    # errors="ignore": like in _truncate_by_chars, a multi-byte character split at the cut is left out.
+    # The line's own newline is only kept if the whole line fits, and the suffix starts a new line anyway.
+    cut = encoder.decode(first_line_tokens[:target_tokens], errors="ignore")
+    return cut.removesuffix('\n') + suffix
+
 def _truncate_by_chars(text: str, target_tokens: int, model: str, suffix: str) -> str:
     """
     Truncates text by characters to a maximum token limit.
-    Uses binary search for efficiency.
+    Encodes the text once and cuts it at the token limit.
 
     Args:
         text: The text to truncate.
@@ -141,17 +380,10 @@ def _truncate_by_chars(text: str, target_tokens: int, model: str, suffix: str) -
     Returns:
         The truncated text.
     """
-    # Binary search for the right length. 
-    low, high = 0, len(text)
-    
-    while low < high:
-        mid = (low + high + 1) // 2
-        if count_tokens(text[:mid], model) <= target_tokens:
-            low = mid
-        else:
-            high = mid - 1
-
-    return text[:low] + suffix
-        
-
-
+    # One encode and one decode, instead of a binary search re-encoding ever shorter prefixes.
+    # Cutting the tokens also can't split a token in two (cutting characters could).
+    # errors="ignore": a multi-byte character split between the kept and the dropped tokens is
+    # left out instead of showing up as a replacement character.
+    encoder = get_encoder(model)
+    tokens = encoder.encode_ordinary(text)
+    return encoder.decode(tokens[:target_tokens], errors="ignore") + suffix